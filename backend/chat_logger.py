@@ -1,9 +1,24 @@
 import os
 import json
+import asyncio
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
+from redis_cache import get_redis_client
+
+SUMMARY_INDEX_KEY = "chat_log_index"
+SUMMARY_KEY_PREFIX = "chat_log_summary:"
+# Set once the index holds every chat on disk; until then summaries rebuild from disk
+SUMMARY_BUILT_KEY = "chat_log_index_built"
+# /chats/logs/summary returns at most this many of the most recently active chats
+SUMMARY_LIMIT = 200
+
+# Background writer drains queued log calls in batches of up to this many
+# events, waiting at most this long for a batch to fill
+LOG_BATCH_SIZE = 50
+LOG_BATCH_INTERVAL = 0.1
 
 class ChatLogger:
     """
@@ -20,6 +35,12 @@ class ChatLogger:
         self.base_log_dir = Path(base_log_dir)
         self.base_log_dir.mkdir(exist_ok=True)
         self.chat_loggers: Dict[str, logging.Logger] = {}
+        # Chats whose Redis summary has been seeded from disk by this process
+        self._indexed_chats: set = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Per-thread buffer of events while a queued batch is being written
+        self._batch = threading.local()
         
     def get_chat_logger(self, chat_id: str) -> logging.Logger:
         """
@@ -57,6 +78,72 @@ class ChatLogger:
             
         return self.chat_loggers[chat_id]
     
+    def enqueue(self, method: str, *args, **kwargs):
+        """
+        Queue a log_* call for the background writer.
+        
+        Runs the call inline when the writer has not been started, e.g. when
+        the logger is used outside the FastAPI app.
+        """
+        if self._queue is None:
+            getattr(self, method)(*args, **kwargs)
+            return
+        self._queue.put_nowait((method, args, kwargs))
+    
+    def start_writer(self):
+        """Start the background task that drains queued log calls"""
+        if self._writer_task is None:
+            self._queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._run_writer())
+    
+    async def stop_writer(self):
+        """Flush queued log calls and stop the background writer"""
+        if self._writer_task is None:
+            return
+        await self._queue.join()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        self._queue = None
+    
+    async def _run_writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + LOG_BATCH_INTERVAL
+            while len(batch) < LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, batch):
+        """Run queued log calls, then append each chat's events in a single write"""
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._batch.pending = pending
+        try:
+            for method, args, kwargs in batch:
+                try:
+                    getattr(self, method)(*args, **kwargs)
+                except Exception as e:
+                    logging.getLogger(__name__).error(f"Failed to write queued {method}: {e}")
+        finally:
+            self._batch.pending = None
+        
+        for chat_id, events in pending.items():
+            self._append_events(chat_id, events)
+    
     def log_user_message(self, chat_id: str, message: str, timestamp: Optional[datetime] = None):
         """Log user message"""
         logger = self.get_chat_logger(chat_id)
@@ -159,18 +246,169 @@ class ChatLogger:
     
     def _save_chat_event(self, chat_id: str, event_data: Dict[str, Any]):
         """Save chat event as JSON for structured access"""
+        pending = getattr(self._batch, "pending", None)
+        if pending is not None:
+            pending.setdefault(chat_id, []).append(event_data)
+            return
+        self._append_events(chat_id, [event_data])
+    
+    def _append_events(self, chat_id: str, events: List[Dict[str, Any]]):
+        """Append events to the chat's events file in one write and update the index"""
         chat_dir = self.base_log_dir / f"chat_{chat_id}"
         events_file = chat_dir / "events.jsonl"
         
         try:
             with open(events_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event_data) + '\n')
+                f.write(''.join(json.dumps(event_data) + '\n' for event_data in events))
         except Exception as e:
             main_logger = logging.getLogger(__name__)
             main_logger.error(f"Failed to save chat event for {chat_id}: {e}")
+            return
+        
+        self._update_summary_index(chat_id, events)
+    
+    def _summary_key(self, chat_id: str) -> str:
+        return f"{SUMMARY_KEY_PREFIX}{chat_id}"
+    
+    def _queue_summary(self, pipe, summary: Dict[str, Any]):
+        """Queue a chat summary hash and its position in the activity index on a pipeline"""
+        chat_id = summary["chat_id"]
+        last_activity = summary["last_activity"]
+        pipe.hset(self._summary_key(chat_id), mapping={
+            "message_count": summary["message_count"],
+            "error_count": summary["error_count"],
+            "last_activity": last_activity or ""
+        })
+        score = datetime.fromisoformat(last_activity).timestamp() if last_activity else 0
+        pipe.zadd(SUMMARY_INDEX_KEY, {chat_id: score})
+    
+    def _write_summary_index(self, client, summary: Dict[str, Any]):
+        """Store a chat summary hash and its position in the activity index"""
+        pipe = client.pipeline(transaction=False)
+        self._queue_summary(pipe, summary)
+        pipe.execute()
+    
+    def _update_summary_index(self, chat_id: str, events: List[Dict[str, Any]]):
+        """Keep the Redis summary for a chat in step with its events file, in one pipeline"""
+        client = get_redis_client()
+        if client is None:
+            return
+        
+        try:
+            pipe = client.pipeline(transaction=False)
+            if chat_id not in self._indexed_chats:
+                # First events seen by this process: seed from disk (which
+                # already holds them) so counts written before a restart are not lost
+                self._queue_summary(pipe, self._scan_chat_summary(chat_id))
+            else:
+                key = self._summary_key(chat_id)
+                for event_data in events:
+                    if event_data["type"] in ['user_message', 'bot_response']:
+                        pipe.hincrby(key, "message_count", 1)
+                    elif event_data["type"] == 'error':
+                        pipe.hincrby(key, "error_count", 1)
+                timestamp = max(event_data["timestamp"] for event_data in events)
+                pipe.hset(key, "last_activity", timestamp)
+                pipe.zadd(SUMMARY_INDEX_KEY, {chat_id: datetime.fromisoformat(timestamp).timestamp()})
+            pipe.execute()
+            self._indexed_chats.add(chat_id)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Failed to update log index for {chat_id}: {e}")
+    
+    def _parse_summary(self, chat_id: str, data: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "chat_id": chat_id,
+            "message_count": int(data.get("message_count", 0)),
+            "error_count": int(data.get("error_count", 0)),
+            "last_activity": data.get("last_activity") or None
+        }
     
     def get_chat_summary(self, chat_id: str) -> Dict[str, Any]:
-        """Get summary statistics for a chat"""
+        """Get summary statistics for a chat, preferring the Redis index"""
+        client = get_redis_client()
+        if client is not None:
+            try:
+                data = client.hgetall(self._summary_key(chat_id))
+                if data:
+                    return self._parse_summary(chat_id, data)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Failed to read log index for {chat_id}: {e}")
+        
+        summary = self._scan_chat_summary(chat_id)
+        if client is not None and summary["last_activity"]:
+            try:
+                self._write_summary_index(client, summary)
+            except Exception:
+                pass
+        return summary
+    
+    def get_chat_summaries(self, limit: int = SUMMARY_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Get summaries for the most recently active logged chats, most recent first.
+        
+        Reads the Redis index when available and falls back to scanning
+        the log directory (rebuilding the index) otherwise. The index only
+        covers chats that were active since it was built, so it is rebuilt
+        from disk whenever the built marker is missing.
+        """
+        client = get_redis_client()
+        if client is None:
+            return self._sort_summaries(self._scan_all_summaries())[:limit]
+        
+        try:
+            if not client.exists(SUMMARY_BUILT_KEY):
+                return self.rebuild_summary_index()[:limit]
+            chat_ids = client.zrevrange(SUMMARY_INDEX_KEY, 0, limit - 1)
+            if not chat_ids:
+                return self.rebuild_summary_index()[:limit]
+            
+            pipe = client.pipeline(transaction=False)
+            for chat_id in chat_ids:
+                pipe.hgetall(self._summary_key(chat_id))
+            
+            summaries = []
+            for chat_id, data in zip(chat_ids, pipe.execute()):
+                if data:
+                    summaries.append(self._parse_summary(chat_id, data))
+                else:
+                    summaries.append(self.get_chat_summary(chat_id))
+            return summaries
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Failed to read log index: {e}")
+            return self._sort_summaries(self._scan_all_summaries())[:limit]
+    
+    def rebuild_summary_index(self) -> List[Dict[str, Any]]:
+        """Rebuild the Redis summary index from the log directory"""
+        summaries = self._scan_all_summaries()
+        client = get_redis_client()
+        if client is not None:
+            pipe = client.pipeline(transaction=False)
+            pipe.delete(SUMMARY_INDEX_KEY)
+            for summary in summaries:
+                self._queue_summary(pipe, summary)
+            pipe.set(SUMMARY_BUILT_KEY, datetime.now().isoformat())
+            pipe.execute()
+            self._indexed_chats.update(summary["chat_id"] for summary in summaries)
+        return self._sort_summaries(summaries)
+    
+    @staticmethod
+    def _sort_summaries(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order summaries most recently active first"""
+        return sorted(summaries, key=lambda s: s["last_activity"] or "", reverse=True)
+    
+    def _scan_all_summaries(self) -> List[Dict[str, Any]]:
+        if not self.base_log_dir.exists():
+            return []
+        
+        summaries = []
+        for chat_dir in self.base_log_dir.iterdir():
+            if chat_dir.is_dir() and chat_dir.name.startswith('chat_'):
+                chat_id = chat_dir.name.replace('chat_', '', 1)
+                summaries.append(self._scan_chat_summary(chat_id))
+        return summaries
+    
+    def _scan_chat_summary(self, chat_id: str) -> Dict[str, Any]:
+        """Compute summary statistics for a chat from its events file"""
         chat_dir = self.base_log_dir / f"chat_{chat_id}"
         events_file = chat_dir / "events.jsonl"
         
@@ -214,8 +452,19 @@ class ChatLogger:
                     if chat_dir.stat().st_mtime < cutoff_date:
                         import shutil
                         shutil.rmtree(chat_dir)
+                        self._remove_from_index(chat_dir.name.replace('chat_', '', 1))
                         logging.info(f"Cleaned up old chat logs: {chat_dir.name}")
                 except Exception as e:
                     logging.error(f"Failed to cleanup {chat_dir.name}: {e}")
+    
+    def _remove_from_index(self, chat_id: str):
+        client = get_redis_client()
+        if client is None:
+            return
+        pipe = client.pipeline(transaction=False)
+        pipe.zrem(SUMMARY_INDEX_KEY, chat_id)
+        pipe.delete(self._summary_key(chat_id))
+        pipe.execute()
+        self._indexed_chats.discard(chat_id)
 
 chat_logger = ChatLogger()
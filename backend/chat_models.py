@@ -94,8 +94,9 @@ class ChatManager:
         """Get a specific chat session"""
         return self.sessions.get(chat_id)
     
-    def list_chats(self) -> List[Dict[str, Any]]:
-        """List all chat sessions"""
+    def list_chats(self, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """List one page of chat sessions (sorted by most recent)"""
+        ordered = sorted(self.sessions.values(), key=lambda x: x.updated_at, reverse=True)
         return [
             {
                 "chat_id": chat.chat_id,
@@ -104,9 +105,13 @@ class ChatManager:
                 "updated_at": chat.updated_at.isoformat(),
                 "last_message": chat.messages[-1].content[:100] + "..." if chat.messages else ""
             }
-            for chat in sorted(self.sessions.values(), key=lambda x: x.updated_at, reverse=True)
+            for chat in ordered[offset:offset + limit]
         ]
     
+    def count_chats(self) -> int:
+        """Get the total number of chat sessions"""
+        return len(self.sessions)
+    
     def delete_chat(self, chat_id: str) -> bool:
         """Delete a chat session"""
         if chat_id in self.sessions:
@@ -128,3 +133,11 @@ class ChatManager:
             self.sessions[chat_id].add_message(message)
             return True
         return False
+    
+    def append_messages(self, chat: ChatSession, *messages: ChatMessage) -> bool:
+        """Append messages to an already loaded chat"""
+        if chat.chat_id not in self.sessions:
+            return False
+        for message in messages:
+            chat.add_message(message)
+        return True
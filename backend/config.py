@@ -1,14 +1,83 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from logger_config import get_logger
+import orjson
 import os
 
-def create_app():
-    app = FastAPI()
+logger = get_logger(__name__)
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # 50MB
+# Allowance for multipart boundaries and part headers around the file itself
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson (FastAPI's own ORJSONResponse is deprecated)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized uploads from their Content-Length before the body is read"""
+
+    def __init__(self, app, path: str = "/upload_pdf/",
+                 max_bytes: int = MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == self.path:
+            for name, value in scope["headers"]:
+                if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                    response = ORJSONResponse({"error": "File size exceeds 50MB limit."}, status_code=413)
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+class UnhandledExceptionMiddleware:
+    """Log any error a route did not handle and return a generic 500"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error(f"Error in {scope['method']} {scope['path']}: {exc}")
+            # A streaming response that already sent its headers cannot become a 500
+            if response_started:
+                raise
+            response = ORJSONResponse({"error": "Internal server error occurred."}, status_code=500)
+            await response(scope, receive, send)
+
+
+def create_app(lifespan=None):
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
     
     allowed_origins = [origin.strip() for origin in os.getenv(
         "ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173"
     ).split(",") if origin.strip()]
     
+    # Added before CORS so rejections and error responses still carry CORS headers
+    app.add_middleware(UnhandledExceptionMiddleware)
+    app.add_middleware(UploadSizeLimitMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=allowed_origins,
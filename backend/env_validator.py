@@ -22,7 +22,13 @@ class EnvironmentValidator:
         "SCORE_THRESHOLD": "0.75",
         "MAX_CHUNKS": "2",
         "LOG_LEVEL": "WARNING",
-        "ALLOWED_ORIGINS": "http://localhost:3000,http://localhost:5173"
+        "ALLOWED_ORIGINS": "http://localhost:3000,http://localhost:5173",
+        "PRELOAD_PIPELINE": "false",
+        "REDIS_MAX_CONNECTIONS": "100",
+        "STREAM_STAGE_TIMEOUT": "60",
+        "UPLOAD_MAX_WORKERS": "16",
+        "S3_TRANSFER_CONCURRENCY": "16",
+        "UPLOAD_LEDGER_PATH": "logs/transfer.db"
     }
     
     @classmethod
@@ -1,6 +1,7 @@
 import os
 import requests
 import re
+from functools import lru_cache
 from typing import List
 
 HUGGINGFACE_API_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-mnli"
@@ -30,6 +31,9 @@ DIRECT_INDICATORS = [
     r'^\s*(yes|no|ok|okay|sure|maybe|perhaps)\s*[.!?]*\s*$'
 ]
 
+_DIRECT_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in DIRECT_INDICATORS]
+_RETRIEVAL_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in RETRIEVAL_INDICATORS]
+
 def classify_intent_rules(query: str) -> str:
     """
     Rule-based intent classification optimized for medical/document Q&A.
@@ -37,12 +41,12 @@ def classify_intent_rules(query: str) -> str:
     """
     query_lower = query.lower().strip()
     
-    for pattern in DIRECT_INDICATORS:
-        if re.search(pattern, query_lower, re.IGNORECASE):
+    for pattern in _DIRECT_PATTERNS:
+        if pattern.search(query_lower):
             return "direct"
     
-    for pattern in RETRIEVAL_INDICATORS:
-        if re.search(pattern, query_lower, re.IGNORECASE):
+    for pattern in _RETRIEVAL_PATTERNS:
+        if pattern.search(query_lower):
             return "retrieval"
     
     return "retrieval"
@@ -58,9 +62,15 @@ def classify_intent_hybrid(query: str) -> str:
     
     return rule_result
 
+@lru_cache(maxsize=4096)
+def _classify_normalized(normalized_query: str) -> str:
+    """Cached classification keyed on the normalized query text"""
+    return classify_intent_hybrid(normalized_query)
+
 def classify_intent(query: str) -> str:
     """
     Main intent classification function.
     Uses rule-based approach optimized for medical document Q&A.
+    Repeated questions are answered from an in-process cache.
     """
-    return classify_intent_hybrid(query)
+    return _classify_normalized(query.strip().lower())
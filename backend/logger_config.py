@@ -1,5 +1,8 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 def setup_logging(log_level=None, log_file=None):
@@ -52,6 +55,70 @@ def setup_logging(log_level=None, log_file=None):
     
     return root_logger
 
+def setup_transfer_logging(log_file='logs/transfers.log', logger_name='upload'):
+    """
+    Keep a durable, rotating record of per-file S3 transfer results
+    
+    Args:
+        log_file: Path of the transfer log file
+        logger_name: Logger whose records are written to the file
+    """
+    transfer_logger = logging.getLogger(logger_name)
+    transfer_logger.setLevel(logging.INFO)
+    
+    try:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5)
+        handler.setLevel(logging.INFO)
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        transfer_logger.addHandler(handler)
+    except Exception as e:
+        logging.warning(f"Could not set up transfer logging to {log_file}: {e}")
+    
+    return transfer_logger
+
+ERROR_LOG_FILE = os.path.join(os.path.dirname(__file__), 'error_logs', 'errors.log')
+
+_error_listener = None
+
+def setup_error_logging(log_file=ERROR_LOG_FILE):
+    """
+    Route the 'errors' logger to a rotating file written by a background thread
+    
+    Args:
+        log_file: Path of the error log file
+    """
+    global _error_listener
+    error_logger = logging.getLogger('errors')
+    if _error_listener is not None:
+        return error_logger
+    
+    try:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        file_handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter(
+            '[%(asctime)s] %(message)s',
+            datefmt='%Y-%m-%dT%H:%M:%S'
+        ))
+    except Exception as e:
+        logging.warning(f"Could not set up error logging to {log_file}: {e}")
+        return error_logger
+    
+    # Callers only enqueue the record; the listener thread does the file I/O
+    log_queue = queue.Queue(-1)
+    _error_listener = QueueListener(log_queue, file_handler)
+    _error_listener.start()
+    atexit.register(_error_listener.stop)
+    
+    error_logger.addHandler(QueueHandler(log_queue))
+    error_logger.setLevel(logging.ERROR)
+    error_logger.propagate = False
+    
+    return error_logger
+
 def get_logger(name):
     """Get a logger instance for the given name"""
     return logging.getLogger(name)
@@ -1,20 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from config import create_app
-from routes import router
-from logger_config import setup_logging
+from routes import router, get_pipeline
+from chat_logger import chat_logger
+from logger_config import setup_logging, setup_error_logging
 import os
 
 log_level = os.getenv('LOG_LEVEL', 'WARNING')  
 setup_logging(log_level=log_level, log_file='logs/app.log')
+setup_error_logging()
 
-app = create_app()
-app.include_router(router)
-
-@app.on_event("shutdown")
-def shutdown_pipeline():
-    """Close RAGPipeline singleton on application shutdown"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the chat log writer, optionally warm the RAGPipeline, and clean up on shutdown"""
+    chat_logger.start_writer()
+    # Workers load the pipeline lazily on first use; set PRELOAD_PIPELINE=true
+    # to pay the initialization cost at startup instead.
+    if os.getenv('PRELOAD_PIPELINE', 'false').lower() == 'true':
+        get_pipeline()
+    yield
+    await chat_logger.stop_writer()
     try:
-        from routes import pipeline
-        pipeline.close()
+        if get_pipeline.cache_info().currsize:
+            get_pipeline().close()
     except Exception:
-        pass
\ No newline at end of file
+        pass
+
+app = create_app(lifespan=lifespan)
+app.include_router(router)
@@ -84,6 +84,7 @@ class QueryToDocResponse:
     documents: List[DocumentSelectionResult]
     best_match: Optional[Dict] = None
     normalization_method: str = "sqrt"
+    query_embedding: Optional[List[float]] = None
 
 @dataclass
 class AutoQueryResponse:
@@ -1,9 +1,10 @@
 import os
 import time
 import json
+import asyncio
 import datetime
 import requests
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, AsyncIterator
 from pymongo import MongoClient
 import boto3
 from botocore.exceptions import ClientError
@@ -23,6 +24,7 @@ from utils import (
     save_log_to_file, 
     log_error_to_file, 
     clean_llm_response,
+    ThinkTagFilter,
     format_tables_for_llm,
     generate_timestamp,
     extract_pdf_id_from_s3_key,
@@ -34,6 +36,9 @@ from redis_cache import redis_cache_get, redis_cache_set
 
 logger = get_logger(__name__)
 
+NO_INFORMATION_RESPONSE = "No relevant information found."
+NO_CONTENT_RESPONSE = "No relevant information with content was found."
+
 
 class RAGPipeline:
     """Main RAG Pipeline class for document retrieval and generation"""
@@ -45,6 +50,13 @@ class RAGPipeline:
         self.mongo_client = MongoClient(self.config.mongo_uri)        
         self.s3_data_cache: Dict[str, S3Data] = {}
         
+        # Long-lived clients so embedding and S3 calls reuse pooled keep-alive connections
+        self.embedding_client = InferenceClient(
+            model=self.config.embedding_model,
+            token=self.config.huggingface_key
+        )
+        self.s3_client = boto3.client('s3')
+        
         self._setup_llm()
         
         logger.info("RAG Pipeline initialized successfully")
@@ -84,14 +96,9 @@ INSTRUCTIONS:
 
     def get_text_embedding(self, text: str) -> List[float]:
         """Get text embedding using HuggingFace API with retry logic"""
-        client = InferenceClient(
-            model=self.config.embedding_model,
-            token=self.config.huggingface_key
-        )
-        
         for attempt in range(self.config.embedding_retries):
             try:
-                embedding = client.feature_extraction(text=text)
+                embedding = self.embedding_client.feature_extraction(text=text)
                 if hasattr(embedding, "tolist"):
                     return embedding.tolist()
                 return embedding.tolist() if hasattr(embedding, 'tolist') else list(embedding)
@@ -121,7 +128,7 @@ INSTRUCTIONS:
             self.s3_data_cache[pdf_id] = result
             return result
 
-        s3 = boto3.client('s3')
+        s3 = self.s3_client
         result = S3Data(tables=[], images=[])
 
         tables_key = f"{self.config.s3_prefix}/{pdf_id}/tables.json"
@@ -173,11 +180,14 @@ INSTRUCTIONS:
         self,
         query: str,
         limit: int = 5,
-        pdf_id: Optional[str] = None
+        pdf_id: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> RetrievalResult:
-        """Retrieve relevant context from MongoDB and enrich with S3 data, with Redis cache for Mongo results"""
+        """
+        Retrieve relevant context from MongoDB and enrich with S3 data, with Redis cache for Mongo results.
+        The query is only embedded on a cache miss, and not at all if query_embedding is supplied.
+        """
         db = self.mongo_client["vector_database"]
-        query_embedding = self.get_text_embedding(query)
 
         redis_key = f"mongo:context:{query}:{limit}:{pdf_id}"
         cached = redis_cache_get(redis_key)
@@ -210,6 +220,9 @@ INSTRUCTIONS:
                 s3_cache=cached.get("s3_cache", {})
             )
 
+        if query_embedding is None:
+            query_embedding = self.get_text_embedding(query)
+
         text_pipeline = [
             {
                 "$vectorSearch": {
@@ -319,7 +332,8 @@ INSTRUCTIONS:
         query: str, 
         top_k_chunks: Optional[int] = None, 
         normalization: Optional[str] = None, 
-        min_chunks: Optional[int] = None
+        min_chunks: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Tuple[str, float]]:
         """
         Find the most relevant documents with configurable normalization methods.
@@ -329,6 +343,7 @@ INSTRUCTIONS:
             top_k_chunks: Number of chunks to retrieve per collection (default from config)
             normalization: Normalization method ('none', 'linear', 'sqrt', 'log') (default from config)
             min_chunks: Minimum number of chunks required for a document to be considered (default from config)
+            query_embedding: Precomputed embedding of the query (computed if not given)
         
         Returns:
             List of tuples: (doc_id, normalized_score)
@@ -344,7 +359,8 @@ INSTRUCTIONS:
             min_chunks = self.config.min_document_chunks
         
         db = self.mongo_client["vector_database"]
-        query_embedding = self.get_text_embedding(query)
+        if query_embedding is None:
+            query_embedding = self.get_text_embedding(query)
 
         all_results = []
         
@@ -457,7 +473,8 @@ INSTRUCTIONS:
             normalization: Normalization method to use (default from config)
         
         Returns:
-            QueryToDocResponse with ranked documents
+            QueryToDocResponse with ranked documents and the query embedding,
+            which callers can reuse for chunk retrieval
         """
         if top_n is None:
             top_n = self.config.max_documents_returned
@@ -466,8 +483,9 @@ INSTRUCTIONS:
             
         logger.info(f"Finding most relevant documents for query: '{query[:60]}{'...' if len(query) > 60 else ''}'")
         
+        query_embedding = self.get_text_embedding(query)
         ranked_docs = self.find_top_documents_with_normalization(
-            query, normalization=normalization
+            query, normalization=normalization, query_embedding=query_embedding
         )
         
         if not ranked_docs:
@@ -477,7 +495,8 @@ INSTRUCTIONS:
                 total_documents_found=0,
                 documents_returned=0,
                 documents=[],
-                normalization_method=normalization
+                normalization_method=normalization,
+                query_embedding=query_embedding
             )
         
         top_docs = ranked_docs[:top_n] if len(ranked_docs) >= top_n else ranked_docs
@@ -498,7 +517,7 @@ INSTRUCTIONS:
             if show_previews:
                 try:
                     preview_chunks = self.retrieve_context(
-                        query, limit=1, pdf_id=doc_id
+                        query, limit=1, pdf_id=doc_id, query_embedding=query_embedding
                     )
                     
                     if preview_chunks.context_chunks and preview_chunks.context_chunks[0].text:
@@ -532,7 +551,8 @@ INSTRUCTIONS:
             documents_returned=len(top_docs),
             documents=document_results,
             best_match=best_match,
-            normalization_method=normalization
+            normalization_method=normalization,
+            query_embedding=query_embedding
         )
 
     def ask_with_auto_selection(
@@ -582,7 +602,8 @@ INSTRUCTIONS:
                 question=query,
                 pdf_s3_key=selected_doc_id,
                 top_k=top_k,
-                use_summarization=False
+                use_summarization=False,
+                query_embedding=doc_selection.query_embedding
             )
             
             return AutoQueryResponse(
@@ -607,10 +628,16 @@ INSTRUCTIONS:
                 selection_method=normalization
             )
 
-    def _fallback_retrieve(self, query: str, limit: int = 2) -> RetrievalResult:
+    def _fallback_retrieve(
+        self, 
+        query: str, 
+        limit: int = 2, 
+        query_embedding: Optional[List[float]] = None
+    ) -> RetrievalResult:
         """Fallback retrieval without score threshold"""
         db = self.mongo_client["vector_database"]
-        query_embedding = self.get_text_embedding(query)
+        if query_embedding is None:
+            query_embedding = self.get_text_embedding(query)
         
         # Get top results regardless of score
         text_results = list(db["textEmbeddings"].aggregate([
@@ -730,13 +757,69 @@ INSTRUCTIONS:
         raw_response = self.chain.invoke({"context": context, "question": question})
         return clean_llm_response(raw_response)
 
+    async def generate_response_stream(self, context: str, question: str) -> AsyncIterator[str]:
+        """Stream the LLM response as it is generated, with thinking sections removed"""
+        logger.info(f"Streaming answer for question: {question}")
+        
+        think_filter = ThinkTagFilter()
+        async for chunk in self.chain.astream({"context": context, "question": question}):
+            visible = think_filter.feed(chunk)
+            if visible:
+                yield visible
+        
+        remainder = think_filter.flush()
+        if remainder:
+            yield remainder
+
+    def prepare_context(
+        self, 
+        question: str, 
+        pdf_s3_key: str, 
+        top_k: int = 3,
+        use_summarization: bool = False,
+        retrieval_query: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> Tuple[RetrievalResult, str]:
+        """
+        Retrieve chunks for a question and build the LLM context from them
+        
+        Args:
+            question: User's question
+            pdf_s3_key: S3 key for the PDF (or filename)
+            top_k: Number of top results to retrieve
+            use_summarization: Whether to use text summarization
+            retrieval_query: Text to search with, if different from the question
+            query_embedding: Precomputed embedding of the retrieval query
+            
+        Returns:
+            The retrieval result and the context string (empty if nothing usable was found)
+        """
+        pdf_s3_key = normalize_s3_key(pdf_s3_key)
+        pdf_id = extract_pdf_id_from_s3_key(pdf_s3_key)
+        
+        retrieval_query = retrieval_query or question
+        retrieval_result = self.retrieve_context(
+            retrieval_query, limit=top_k, pdf_id=pdf_id, query_embedding=query_embedding
+        )
+        
+        if not retrieval_result.has_content():
+            logger.info("No high-score content found, using fallback retrieval")
+            retrieval_result = self._fallback_retrieve(retrieval_query, limit=2, query_embedding=query_embedding)
+        
+        if not retrieval_result.has_content():
+            return retrieval_result, ""
+        
+        return retrieval_result, self._build_context_string(retrieval_result.context_chunks, use_summarization)
+
     def run(
         self, 
         question: str, 
         pdf_s3_key: str, 
         top_k: int = 3,
         use_summarization: bool = False,
-        debug_log_dir: Optional[str] = None
+        debug_log_dir: Optional[str] = None,
+        retrieval_query: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> RAGResponse:
         """
         Main RAG pipeline execution
@@ -747,16 +830,17 @@ INSTRUCTIONS:
             top_k: Number of top results to retrieve
             use_summarization: Whether to use text summarization
             debug_log_dir: Directory to save debug logs
+            retrieval_query: Text to search with, if different from the question
+            query_embedding: Precomputed embedding of the retrieval query
             
         Returns:
             RAGResponse with the generated answer
         """
         timestamp = generate_timestamp()
-        pdf_s3_key = normalize_s3_key(pdf_s3_key)
-        pdf_id = extract_pdf_id_from_s3_key(pdf_s3_key)
         
-        # Retrieve context
-        retrieval_result = self.retrieve_context(question, limit=top_k, pdf_id=pdf_id)
+        retrieval_result, context = self.prepare_context(
+            question, pdf_s3_key, top_k, use_summarization, retrieval_query, query_embedding
+        )
         
         # Save debug logs if requested
         if debug_log_dir:
@@ -764,22 +848,16 @@ INSTRUCTIONS:
             save_log_to_file(debug_log_dir, f"{timestamp}_mongo_image_results", retrieval_result.raw_mongo_images)
             save_log_to_file(debug_log_dir, f"{timestamp}_s3_cache", retrieval_result.s3_cache)
         
-        if not retrieval_result.has_content():
-            logger.info("No high-score content found, using fallback retrieval")
-            retrieval_result = self._fallback_retrieve(question, limit=2)
-        
         if not retrieval_result.has_content():
             return RAGResponse(
-                cleaned_response="No relevant information found.",
-                raw_response="No relevant information found."
+                cleaned_response=NO_INFORMATION_RESPONSE,
+                raw_response=NO_INFORMATION_RESPONSE
             )
         
-        context = self._build_context_string(retrieval_result.context_chunks, use_summarization)
-        
         if not context:
             return RAGResponse(
-                cleaned_response="No relevant information with content was found.",
-                raw_response="No relevant information with content was found."
+                cleaned_response=NO_CONTENT_RESPONSE,
+                raw_response=NO_CONTENT_RESPONSE
             )
         
         if debug_log_dir:
@@ -826,9 +904,48 @@ INSTRUCTIONS:
             context_used=retrieval_result.context_chunks
         )
 
+    async def run_stream(
+        self, 
+        question: str, 
+        pdf_s3_key: str, 
+        top_k: int = 3,
+        use_summarization: bool = False,
+        retrieval_query: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of run() that yields the answer as the LLM produces it
+        
+        Args:
+            question: User's question
+            pdf_s3_key: S3 key for the PDF (or filename)
+            top_k: Number of top results to retrieve
+            use_summarization: Whether to use text summarization
+            retrieval_query: Text to search with, if different from the question
+            query_embedding: Precomputed embedding of the retrieval query
+            
+        Yields:
+            Chunks of the generated answer
+        """
+        retrieval_result, context = await asyncio.to_thread(
+            self.prepare_context, question, pdf_s3_key, top_k, use_summarization,
+            retrieval_query, query_embedding
+        )
+        
+        if not retrieval_result.has_content():
+            yield NO_INFORMATION_RESPONSE
+            return
+        
+        if not context:
+            yield NO_CONTENT_RESPONSE
+            return
+        
+        async for chunk in self.generate_response_stream(context, question):
+            yield chunk
+
     def upload_pdf_to_s3(self, file: UploadFile, s3_key: str) -> bool:
         """Upload PDF file to S3"""
-        s3 = boto3.client('s3')
+        s3 = self.s3_client
         try:
             file.file.seek(0)
             s3.upload_fileobj(
@@ -1,9 +1,9 @@
 """
 Redis-based chat management for persistent storage
 """
-import json
+import orjson
 import redis
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Callable
 from datetime import datetime
 from dataclasses import asdict
 from chat_models import ChatSession, ChatMessage, MessageType
@@ -12,6 +12,9 @@ import os
 
 logger = get_logger(__name__)
 
+# Attempts to apply a chat update before giving up on a heavily contended chat
+CHAT_UPDATE_ATTEMPTS = 5
+
 class RedisChatManager:
     """Redis-based chat manager for persistent storage"""
     
@@ -21,17 +24,22 @@ class RedisChatManager:
         self.redis_client: Optional[redis.Redis] = None
         self.key_prefix = "chat:"
         self.chat_list_key = "chat_list"
+        self.max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '100'))
         
     def connect(self):
         """Establish Redis connection"""
         try:
-            self.redis_client = redis.from_url(
+            # Requests run chat operations from worker threads, so share a
+            # bounded pool instead of serializing them on one connection
+            pool = redis.ConnectionPool.from_url(
                 self.redis_url, 
+                max_connections=self.max_connections,
                 decode_responses=True,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True
             )
+            self.redis_client = redis.Redis(connection_pool=pool)
             # Test connection
             self.redis_client.ping()
             logger.info("Successfully connected to Redis")
@@ -45,27 +53,12 @@ class RedisChatManager:
             self.redis_client.close()
             logger.info("Redis connection closed")
     
-    def _serialize_chat(self, chat: ChatSession) -> str:
+    def _serialize_chat(self, chat: ChatSession) -> bytes:
         """Serialize chat session to JSON"""
+        # orjson walks the dataclasses directly, writing enums by value and
+        # naive datetimes in the same format as datetime.isoformat()
         try:
-            chat_data = {
-                "chat_id": chat.chat_id,
-                "title": chat.title,
-                "created_at": chat.created_at.isoformat(),
-                "updated_at": chat.updated_at.isoformat(),
-                "context_window": chat.context_window,
-                "messages": [
-                    {
-                        "id": msg.id,
-                        "content": msg.content,
-                        "message_type": msg.message_type.value,
-                        "timestamp": msg.timestamp.isoformat(),
-                        "metadata": msg.metadata or {}
-                    }
-                    for msg in chat.messages
-                ]
-            }
-            return json.dumps(chat_data)
+            return orjson.dumps(chat)
         except Exception as e:
             logger.error(f"Error serializing chat {chat.chat_id}: {e}")
             raise
@@ -73,7 +66,7 @@ class RedisChatManager:
     def _deserialize_chat(self, chat_data: str) -> ChatSession:
         """Deserialize JSON to chat session"""
         try:
-            data = json.loads(chat_data)
+            data = orjson.loads(chat_data)
             
             # Create messages
             messages = []
@@ -101,6 +94,67 @@ class RedisChatManager:
             logger.error(f"Error deserializing chat data: {e}")
             raise
     
+    def _preview_key(self, chat_id: str) -> str:
+        """Redis key of the small hash used to list a chat without loading it"""
+        return f"{self.key_prefix}{chat_id}:preview"
+    
+    def _build_preview(self, chat: ChatSession) -> Dict[str, Any]:
+        """Fields shown in the chat list, stored alongside the full chat JSON"""
+        return {
+            "chat_id": chat.chat_id,
+            "title": chat.title,
+            "message_count": len(chat.messages),
+            "updated_at": chat.updated_at.isoformat(),
+            "created_at": chat.created_at.isoformat(),
+            "last_message": chat.messages[-1].content[:100] + "..." if chat.messages else ""
+        }
+    
+    def _queue_chat_write(self, pipe, chat: ChatSession) -> None:
+        """Queue the chat, its preview hash and its list score on a pipeline"""
+        pipe.set(f"{self.key_prefix}{chat.chat_id}", self._serialize_chat(chat))
+        pipe.hset(self._preview_key(chat.chat_id), mapping=self._build_preview(chat))
+        pipe.zadd(self.chat_list_key, {chat.chat_id: chat.updated_at.timestamp()})
+    
+    def _write_chat(self, chat: ChatSession) -> None:
+        """Store the chat, its preview hash and its list score in one round trip"""
+        assert self.redis_client is not None
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._queue_chat_write(pipe, chat)
+        pipe.execute()
+    
+    def _update_chat(self, chat_id: str, update: Callable[[ChatSession], None]) -> bool:
+        """
+        Apply update to the latest stored copy of a chat and save it.
+        
+        The chat key is WATCHed so a concurrent rename, delete or append
+        makes the write retry against the new state instead of overwriting
+        it. Returns False if the chat no longer exists, and raises
+        redis.WatchError if it keeps changing for CHAT_UPDATE_ATTEMPTS tries.
+        """
+        if not self.redis_client:
+            self.connect()
+        assert self.redis_client is not None
+        
+        chat_key = f"{self.key_prefix}{chat_id}"
+        with self.redis_client.pipeline() as pipe:
+            for attempt in range(CHAT_UPDATE_ATTEMPTS):
+                try:
+                    pipe.watch(chat_key)
+                    chat_data = pipe.get(chat_key)
+                    if not chat_data or not isinstance(chat_data, str):
+                        pipe.unwatch()
+                        return False
+                    chat = self._deserialize_chat(chat_data)
+                    update(chat)
+                    pipe.multi()
+                    self._queue_chat_write(pipe, chat)
+                    pipe.execute()
+                    return True
+                except redis.WatchError:
+                    if attempt == CHAT_UPDATE_ATTEMPTS - 1:
+                        logger.error(f"Chat {chat_id} changed during {CHAT_UPDATE_ATTEMPTS} update attempts; giving up")
+                        raise
+    
     def create_chat(self, title: str = "New Chat") -> str:
         """Create a new chat session"""
         try:
@@ -115,16 +169,8 @@ class RedisChatManager:
                 title=title
             )
             
-            # Store chat in Redis
-            chat_key = f"{self.key_prefix}{chat_id}"
-            assert self.redis_client is not None
-            self.redis_client.set(chat_key, self._serialize_chat(chat))
-            
-            # Add to chat list
-            self.redis_client.zadd(
-                self.chat_list_key, 
-                {chat_id: chat.updated_at.timestamp()}
-            )
+            # Store chat in Redis and add it to the chat list
+            self._write_chat(chat)
             
             logger.info(f"Created chat {chat_id} in Redis")
             return chat_id
@@ -163,14 +209,8 @@ class RedisChatManager:
             if not self.redis_client:
                 return False
             
-            chat_key = f"{self.key_prefix}{chat.chat_id}"
-            self.redis_client.set(chat_key, self._serialize_chat(chat))
-            
-            # Update in chat list with new timestamp
-            self.redis_client.zadd(
-                self.chat_list_key, 
-                {chat.chat_id: chat.updated_at.timestamp()}
-            )
+            # Store chat and refresh its preview and chat list timestamp
+            self._write_chat(chat)
             
             logger.debug(f"Saved chat {chat.chat_id} to Redis")
             return True
@@ -179,8 +219,8 @@ class RedisChatManager:
             logger.error(f"Error saving chat {chat.chat_id}: {e}")
             return False
     
-    def list_chats(self) -> List[Dict[str, Any]]:
-        """List all chat sessions (sorted by most recent)"""
+    def list_chats(self, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """List one page of chat sessions (sorted by most recent)"""
         try:
             if not self.redis_client:
                 self.connect()
@@ -188,21 +228,27 @@ class RedisChatManager:
             if not self.redis_client:
                 return []
             
-            chat_ids = self.redis_client.zrevrange(self.chat_list_key, 0, -1)
+            chat_ids = self.redis_client.zrevrange(self.chat_list_key, offset, offset + limit - 1)
+            if not chat_ids:
+                return []
             
-            chats = []
+            # Read only the preview hashes, in a single round trip
+            pipe = self.redis_client.pipeline(transaction=False)
             for chat_id in chat_ids:
-                if isinstance(chat_id, str):
+                pipe.hgetall(self._preview_key(chat_id))
+            previews = pipe.execute()
+            
+            chats = []
+            for chat_id, preview in zip(chat_ids, previews):
+                if not preview:
+                    # Chats stored before previews existed: build it once from the full chat
                     chat = self.get_chat(chat_id)
-                    if chat:
-                        chats.append({
-                            "chat_id": chat.chat_id,
-                            "title": chat.title,
-                            "message_count": len(chat.messages),
-                            "updated_at": chat.updated_at.isoformat(),
-                            "created_at": chat.created_at.isoformat(),
-                            "last_message": chat.messages[-1].content[:100] + "..." if chat.messages else ""
-                        })
+                    if not chat:
+                        continue
+                    preview = self._build_preview(chat)
+                    self.redis_client.hset(self._preview_key(chat_id), mapping=preview)
+                preview["message_count"] = int(preview["message_count"])
+                chats.append(preview)
             
             return chats
             
@@ -210,6 +256,21 @@ class RedisChatManager:
             logger.error(f"Error listing chats: {e}")
             return []
     
+    def count_chats(self) -> int:
+        """Get the total number of chat sessions"""
+        try:
+            if not self.redis_client:
+                self.connect()
+            
+            if not self.redis_client:
+                return 0
+            
+            return int(self.redis_client.zcard(self.chat_list_key))
+            
+        except Exception as e:
+            logger.error(f"Error counting chats: {e}")
+            return 0
+    
     def delete_chat(self, chat_id: str) -> bool:
         """Delete a chat session"""
         try:
@@ -223,6 +284,7 @@ class RedisChatManager:
             
             # Remove from Redis
             deleted = self.redis_client.delete(chat_key)
+            self.redis_client.delete(self._preview_key(chat_id))
             
             self.redis_client.zrem(self.chat_list_key, chat_id)
             
@@ -240,14 +302,11 @@ class RedisChatManager:
     def update_chat_title(self, chat_id: str, title: str) -> bool:
         """Update chat title"""
         try:
-            chat = self.get_chat(chat_id)
-            if not chat:
-                return False
-            
-            chat.title = title
-            chat.updated_at = datetime.now()
+            def rename(chat: ChatSession) -> None:
+                chat.title = title
+                chat.updated_at = datetime.now()
             
-            return self.save_chat(chat)
+            return self._update_chat(chat_id, rename)
             
         except Exception as e:
             logger.error(f"Error updating chat title {chat_id}: {e}")
@@ -256,18 +315,39 @@ class RedisChatManager:
     def add_message(self, chat_id: str, message: ChatMessage) -> bool:
         """Add a message to a chat"""
         try:
-            chat = self.get_chat(chat_id)
-            if not chat:
+            if not self._update_chat(chat_id, lambda chat: chat.add_message(message)):
                 logger.error(f"Chat {chat_id} not found")
                 return False
-            
-            chat.add_message(message)
-            return self.save_chat(chat)
+            return True
             
         except Exception as e:
             logger.error(f"Error adding message to chat {chat_id}: {e}")
             return False
     
+    def append_messages(self, chat: ChatSession, *messages: ChatMessage) -> bool:
+        """
+        Append messages to a loaded chat and save them.
+        
+        The stored chat is re-read before writing, so changes made since
+        chat was loaded (a rename, another stream's messages) are kept and
+        a chat deleted in the meantime is not recreated.
+        """
+        try:
+            def append(latest: ChatSession) -> None:
+                for message in messages:
+                    latest.add_message(message)
+            
+            if not self._update_chat(chat.chat_id, append):
+                logger.warning(f"Chat {chat.chat_id} no longer exists; messages not saved")
+                return False
+            for message in messages:
+                chat.add_message(message)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error appending messages to chat {chat.chat_id}: {e}")
+            return False
+    
     def get_conversation_context(self, chat_id: str, limit: Optional[int] = None) -> str:
         """Get conversation context for a chat"""
         try:
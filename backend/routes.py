@@ -1,16 +1,26 @@
-from fastapi import APIRouter, File, UploadFile, Form, Body
-from fastapi.responses import JSONResponse, StreamingResponse
-from upload import PDFUploader
+from fastapi import APIRouter, File, UploadFile, Form, Body, Request, Query
+from fastapi.responses import StreamingResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from upload import get_uploader
+from config import MAX_UPLOAD_BYTES, ORJSONResponse
 import os
-import json
+import time
+import asyncio
 import uuid
+import hashlib
+import re
+import threading
+import orjson
 from datetime import datetime
+from pathlib import Path
+from functools import lru_cache
 from rag_pipeline import RAGPipeline
 from intent_classifier import classify_intent
+from redis_cache import redis_cache_get, redis_cache_set
 from chat_models import ChatManager, ChatMessage
-from pydantic import BaseModel
+from pydantic import BaseModel, StringConstraints
 from logger_config import get_logger
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple, Annotated, AsyncIterator
 from chat_models import ChatManager, ChatSession, ChatMessage, MessageType
 from redis_chat_manager import RedisChatManager
 from chat_logger import chat_logger
@@ -18,9 +28,59 @@ from chat_logger import chat_logger
 logger = get_logger(__name__)
 
 router = APIRouter()
-uploader = PDFUploader()
-# Instantiate a singleton RAGPipeline for all requests
-pipeline = RAGPipeline()
+
+
+@lru_cache(maxsize=1)
+def get_pipeline() -> RAGPipeline:
+    """Lazily create the shared RAGPipeline on first use"""
+    return RAGPipeline()
+
+
+# Serialized /list_pdfs/ body, its ETag and the filenames, rebuilt at most
+# once per TTL; the lock keeps concurrent misses down to one S3 listing.
+# Invalidation bumps the generation so a listing already in flight is not
+# kept as fresh
+LIST_PDFS_CACHE_TTL = 10
+_list_pdfs_cache: Dict[str, Any] = {"body": None, "etag": None, "filenames": [], "expires": 0.0, "generation": 0}
+_list_pdfs_lock = threading.Lock()
+
+
+def invalidate_list_pdfs_cache() -> None:
+    """Force the next /list_pdfs/ request to re-list the bucket"""
+    _list_pdfs_cache["generation"] += 1
+    _list_pdfs_cache["expires"] = 0.0
+
+
+def _refresh_list_pdfs_cache() -> None:
+    """Re-list the bucket into the cache unless another caller just did"""
+    with _list_pdfs_lock:
+        now = time.monotonic()
+        if _list_pdfs_cache["body"] is not None and now < _list_pdfs_cache["expires"]:
+            return
+        generation = _list_pdfs_cache["generation"]
+        pdfs = get_uploader().list_pdfs()
+        filenames = [os.path.basename(pdf['key']) for pdf in pdfs]
+        documents = [{"id": filename, "name": filename, "type": "pdf", "status": "Ready"} 
+                    for filename in filenames]
+        logger.info(f"Found {len(filenames)} PDFs: {filenames}")
+        body = orjson.dumps({"pdfs": filenames, "documents": documents})
+        _list_pdfs_cache["body"] = body
+        _list_pdfs_cache["etag"] = f'"{hashlib.sha1(body).hexdigest()}"'
+        _list_pdfs_cache["filenames"] = filenames
+        # An upload finished while listing: serve this body but re-list next time
+        if _list_pdfs_cache["generation"] == generation:
+            _list_pdfs_cache["expires"] = now + LIST_PDFS_CACHE_TTL
+
+
+def _list_pdfs_cache_is_fresh() -> bool:
+    return _list_pdfs_cache["body"] is not None and time.monotonic() < _list_pdfs_cache["expires"]
+
+
+async def _ensure_list_pdfs_cache() -> None:
+    """Refresh the PDF listing cache in the threadpool only when it is stale"""
+    if not _list_pdfs_cache_is_fresh():
+        await run_in_threadpool(_refresh_list_pdfs_cache)
+
 
 # Initialize Redis-based chat manager
 try:
@@ -32,14 +92,17 @@ except Exception as e:
     logger.warning(f"Failed to connect to Redis: {e}. Falling back to in-memory storage")
     chat_manager = ChatManager()  # Fallback to in-memory
 
+# Questions are stripped and rejected with a 422 when empty before any handler runs
+QuestionText = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
 class QuestionRequest(BaseModel):
-    message: str
+    message: QuestionText
     chat_id: Optional[str] = None
     documents: List[str] = []
     document_ids: List[str] = []
 
 class AutoQueryRequest(BaseModel):
-    message: str
+    message: QuestionText
     chat_id: Optional[str] = None
 
 class CreateChatRequest(BaseModel):
@@ -48,6 +111,9 @@ class CreateChatRequest(BaseModel):
 class UpdateChatRequest(BaseModel):
     title: str
 
+class PresignUploadRequest(BaseModel):
+    filename: str
+
 class UploadResponse(BaseModel):
     message: str
     filename: str
@@ -56,13 +122,9 @@ class ErrorResponse(BaseModel):
     error: str
 
 class QuestionResponse(BaseModel):
-    message: str
-    response: str
     answer: str
 
 class AutoQueryResponse(BaseModel):
-    message: str
-    response: str
     answer: str
     selected_document: str
     selection_score: float
@@ -78,141 +140,244 @@ class ListPDFsResponse(BaseModel):
     pdfs: List[str]
     documents: List[DocumentInfo]
 
-@router.post("/upload_pdf/")
-async def upload_pdf(file: UploadFile = File(...)):
-    try:
-        # Validate file type
-        if not file.filename or not file.filename.lower().endswith('.pdf'):
-            return JSONResponse({"error": "Only PDF files are allowed."}, status_code=400)
-        
-        max_size = 50 * 1024 * 1024  # 50MB
-        if file.size and file.size > max_size:
-            return JSONResponse({"error": "File size exceeds 50MB limit."}, status_code=400)
-        
-        if len(file.filename) > 255:
-            return JSONResponse({"error": "Filename too long."}, status_code=400)
-        
-        file.file.seek(0)
-        success = uploader.upload_pdf_fileobj(file.file, file.filename)
-        
-        if success:
-            return {"message": "PDF uploaded successfully.", "filename": file.filename}
-        else:
-            return JSONResponse({"error": "Upload failed."}, status_code=500)
-    except Exception as e:
-        logger.error(f"Error in upload_pdf: {str(e)}")
-        return JSONResponse({"error": "Internal server error occurred."}, status_code=500)
+# Longest wait for document selection or for the next LLM token before the
+# stream gives up and frees its worker
+STREAM_STAGE_TIMEOUT = float(os.getenv('STREAM_STAGE_TIMEOUT', '60'))
+
+# How often a running stream checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = float(os.getenv('DISCONNECT_POLL_INTERVAL', '0.5'))
 
+class ClientDisconnected(Exception):
+    """Raised into a token stream once its client has gone away"""
 
+async def watch_disconnect(http_request: Request) -> None:
+    """Return as soon as the client behind the request disconnects"""
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+async def iter_with_timeout(tokens: AsyncIterator[str], timeout: float,
+                            http_request: Optional[Request] = None) -> AsyncIterator[str]:
+    """Re-yield an async token stream, raising TimeoutError if any token stalls
+    and ClientDisconnected (after cancelling generation) if the client leaves"""
+    iterator = tokens.__aiter__()
+    watcher = asyncio.create_task(watch_disconnect(http_request)) if http_request else None
+    try:
+        while True:
+            next_token = asyncio.ensure_future(asyncio.wait_for(iterator.__anext__(), timeout))
+            if watcher:
+                await asyncio.wait({next_token, watcher}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_token.done():
+                    next_token.cancel()
+                    await asyncio.gather(next_token, return_exceptions=True)
+                    raise ClientDisconnected()
+            try:
+                token = await next_token
+            except StopAsyncIteration:
+                return
+            yield token
+    finally:
+        if watcher:
+            watcher.cancel()
+        await iterator.aclose()
+
+# Follow-ups that refer back ("expand on that") reuse the previous turn's
+# document for this long instead of running document selection again
+LAST_DOC_TTL = 300
+FOLLOW_UP_PRONOUNS = frozenset({"it", "its", "this", "that", "these", "those", "they", "them", "their"})
+FOLLOW_UP_MAX_WORDS = 8
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+def is_follow_up(message: str) -> bool:
+    """
+    Whether a question points back at the previous answer.
+    
+    Only short questions count, and the pronoun must lead them ("what are
+    its side effects?") or close them ("tell me more about that"), so a new
+    topic that merely contains a pronoun ("what is metformin and how does it
+    work?") still goes through document selection.
+    """
+    words = WORD_PATTERN.findall(message.lower())
+    if not words or len(words) > FOLLOW_UP_MAX_WORDS:
+        return False
+    return any(word in FOLLOW_UP_PRONOUNS for word in words[:3]) or words[-1] in FOLLOW_UP_PRONOUNS
+
+def last_doc_key(chat_id: str) -> str:
+    return f"last_doc:{chat_id}"
+
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+TOKEN_FRAME_SUFFIX = b"}" + SSE_SUFFIX
+# SSE comment sent first so buffering proxies flush the stream straight away
+SSE_PADDING = b":" + b" " * 2048 + SSE_SUFFIX
+
+def sse(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload as one Server-Sent Events data frame"""
+    return SSE_PREFIX + orjson.dumps(payload) + SSE_SUFFIX
+
+@router.post("/upload_pdf/")
+async def upload_pdf(file: UploadFile = File(...)):
+    # Validate file type
+    if not file.filename or not file.filename.lower().endswith('.pdf'):
+        return ORJSONResponse({"error": "Only PDF files are allowed."}, status_code=400)
+    
+    if file.size and file.size > MAX_UPLOAD_BYTES:
+        return ORJSONResponse({"error": "File size exceeds 50MB limit."}, status_code=413)
+    
+    if len(file.filename) > 255:
+        return ORJSONResponse({"error": "Filename too long."}, status_code=400)
+    
+    # Starlette rewinds the spooled file after parsing; boto3 streams it in parts
+    success = await run_in_threadpool(get_uploader().upload_pdf_fileobj, file.file, file.filename)
+    
+    if success:
+        invalidate_list_pdfs_cache()
+        return {"message": "PDF uploaded successfully.", "filename": file.filename}
+    else:
+        return ORJSONResponse({"error": "Upload failed."}, status_code=500)
+
+@router.post("/presign_upload/")
+async def presign_upload(request: PresignUploadRequest):
+    """Return a pre-signed S3 POST so the client uploads the PDF directly to the bucket"""
+    if not request.filename.lower().endswith('.pdf'):
+        return ORJSONResponse({"error": "Only PDF files are allowed."}, status_code=400)
+    
+    if len(request.filename) > 255:
+        return ORJSONResponse({"error": "Filename too long."}, status_code=400)
+    
+    presigned = await run_in_threadpool(
+        get_uploader().presign_upload, request.filename, max_mb=MAX_UPLOAD_BYTES // (1024 * 1024)
+    )
+    if presigned is None:
+        return ORJSONResponse({"error": "Could not create upload URL."}, status_code=500)
+    
+    return presigned
 
 @router.post("/auto_ask/")
 async def auto_ask_question(request: AutoQueryRequest):
-    try:
-        # Validate input
-        if not request.message.strip():
-            return JSONResponse({"error": "Question cannot be empty."}, status_code=400)
-
-        # Determine intent using Hugging Face API
-        intent = classify_intent(request.message)
-        logger.info(f"Intent classified as: {intent}")
-
-        if intent == "direct":
-            # For direct questions, use a simple LLM call (no retrieval)
-            # Here, we use the pipeline's LLM directly with no context
-            answer = pipeline.generate_response(context="", question=request.message)
-            return {
-                "message": answer,
-                "response": answer,
-                "answer": answer,
-                "selected_document": "",
-                "selection_score": 0.0,
-                "documents_considered": 0
-            }
-        else:
-            # Use the singleton pipeline for auto-selection (retrieval-augmented)
-            result = pipeline.ask_with_auto_selection(
-                query=request.message,
-                normalization="sqrt",
-                top_k=5
-            )
-            if result.status == "no_documents_found":
-                return JSONResponse({"error": "No relevant documents found."}, status_code=404)
-            if result.status == "generation_failed":
-                return JSONResponse({"error": result.answer}, status_code=500)
-            return {
-                "message": result.answer,
-                "response": result.answer,
-                "answer": result.answer,
-                "selected_document": result.selected_document or "",
-                "selection_score": result.selection_score or 0.0,
-                "documents_considered": result.documents_considered
-            }
-    except Exception as e:
-        logger.error(f"Error in auto_ask_question: {str(e)}")
-        return JSONResponse({"error": "Internal server error occurred."}, status_code=500)
+    # Determine intent using Hugging Face API
+    intent = classify_intent(request.message)
+    logger.info(f"Intent classified as: {intent}")
+
+    if intent == "direct":
+        # For direct questions, use a simple LLM call (no retrieval)
+        # Here, we use the pipeline's LLM directly with no context
+        answer = await run_in_threadpool(
+            get_pipeline().generate_response, context="", question=request.message
+        )
+        return {
+            "answer": answer,
+            "selected_document": "",
+            "selection_score": 0.0,
+            "documents_considered": 0
+        }
+    else:
+        # Use the singleton pipeline for auto-selection (retrieval-augmented)
+        result = await run_in_threadpool(
+            get_pipeline().ask_with_auto_selection,
+            query=request.message,
+            normalization="sqrt",
+            top_k=5
+        )
+        if result.status == "no_documents_found":
+            return ORJSONResponse({"error": "No relevant documents found."}, status_code=404)
+        if result.status == "generation_failed":
+            return ORJSONResponse({"error": result.answer}, status_code=500)
+        return {
+            "answer": result.answer,
+            "selected_document": result.selected_document or "",
+            "selection_score": result.selection_score or 0.0,
+            "documents_considered": result.documents_considered
+        }
 
 @router.post("/auto_ask_stream/")
-async def auto_ask_question_stream(request: AutoQueryRequest):
+async def auto_ask_question_stream(request: AutoQueryRequest, http_request: Request):
     """Streaming version that sends document selection info first, then the answer"""
     
     async def generate_stream():
+        doc_selection_task = None
+        yield SSE_PADDING
         try:
             logger.info(f"🚀 Starting stream for message: '{request.message[:30]}...' chat_id: {request.chat_id}")
             
             # Log to chat-specific logger
             if request.chat_id:
-                chat_logger.log_user_message(request.chat_id, request.message)
-            
-            # Validate input
-            if not request.message.strip():
-                yield f"data: {json.dumps({'error': 'Question cannot be empty.'})}\n\n"
-                return
+                chat_logger.enqueue("log_user_message", request.chat_id, request.message, datetime.now())
+
+            # Determine intent (rule-based, no network round trip)
+            intent = classify_intent(request.message)
+            logger.info(f"🎯 Intent classified as: {intent} for message: '{request.message[:50]}...'")
+
+            # A follow-up that points back at the last answer stays on its document
+            reused_doc = None
+            if intent != "direct" and request.chat_id and is_follow_up(request.message):
+                reused_doc = await run_in_threadpool(redis_cache_get, last_doc_key(request.chat_id))
+                if not isinstance(reused_doc, dict):
+                    reused_doc = None
+
+            # Document selection only depends on the raw question, so start it now
+            # and let it run while the chat session is loaded and updated
+            if intent != "direct" and not reused_doc:
+                logger.info(f"🔍 Starting document selection for query: '{request.message[:50]}...'")
+                doc_selection_task = asyncio.create_task(run_in_threadpool(
+                    get_pipeline().get_most_relevant_documents,
+                    query=request.message,
+                    top_n=1,
+                    show_previews=False,
+                    normalization="sqrt"
+                ))
 
             # Get or create chat session
             chat_id = request.chat_id
             if not chat_id:
-                chat_id = chat_manager.create_chat("New Chat")
+                chat_id = await run_in_threadpool(chat_manager.create_chat, "New Chat")
             
-            chat = chat_manager.get_chat(chat_id)
+            chat = await run_in_threadpool(chat_manager.get_chat, chat_id)
             if not chat:
-                yield f"data: {json.dumps({'error': 'Chat session not found.'})}\n\n"
+                if doc_selection_task:
+                    doc_selection_task.cancel()
+                yield sse({"error": "Chat session not found."})
                 return
 
+            # Token frames differ only in their delta, so encode the rest once
+            token_frame_prefix = SSE_PREFIX + b'{"type":"token","chat_id":' + orjson.dumps(chat_id) + b',"delta":'
+
+            # Context comes from earlier turns only, not the question being asked
+            conversation_context = chat.get_conversation_summary()
+
             # Add user message to chat history
             user_message = ChatMessage(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 content=request.message,
                 message_type=MessageType.USER,
                 timestamp=datetime.now()
             )
-            
-            # Save user message to Redis if using Redis chat manager
-            if hasattr(chat_manager, 'add_message'):
-                chat_manager.add_message(chat_id, user_message)
-            else:
-                chat.add_message(user_message)
+            await run_in_threadpool(chat_manager.append_messages, chat, user_message)
 
-            # Determine intent using Hugging Face API
-            intent = classify_intent(request.message)
-            logger.info(f"🎯 Intent classified as: {intent} for message: '{request.message[:50]}...'")
-            
             # Log intent classification
             if chat_id:
-                chat_logger.log_intent_classification(chat_id, request.message, intent)
+                chat_logger.enqueue("log_intent_classification", chat_id, request.message, intent)
 
             if intent == "direct":
-
-                conversation_context = chat.get_conversation_summary()
                 if conversation_context:
                     enhanced_query = f"Previous conversation context:\n{conversation_context}\n\nCurrent question: {request.message}"
                 else:
                     enhanced_query = request.message
                 
-                answer = pipeline.generate_response(context="", question=enhanced_query)
+                # Stream tokens as they are generated and keep the full answer for history;
+                # generation is cancelled as soon as the client disconnects
+                answer_parts = []
+                async for token in iter_with_timeout(
+                    get_pipeline().generate_response_stream(context="", question=enhanced_query),
+                    STREAM_STAGE_TIMEOUT,
+                    http_request
+                ):
+                    answer_parts.append(token)
+                    yield token_frame_prefix + orjson.dumps(token) + TOKEN_FRAME_SUFFIX
+                answer = "".join(answer_parts).strip()
                 
                 # Log direct answer
                 if chat_id:
-                    chat_logger.log_bot_response(chat_id, answer, {
+                    chat_logger.enqueue("log_bot_response", chat_id, answer, {
                         "type": "direct_answer",
                         "selected_document": "",
                         "selection_score": 0.0,
@@ -220,7 +385,7 @@ async def auto_ask_question_stream(request: AutoQueryRequest):
                     })
                 
                 bot_message = ChatMessage(  
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     content=answer,
                     message_type=MessageType.BOT,
                     timestamp=datetime.now(),
@@ -231,169 +396,210 @@ async def auto_ask_question_stream(request: AutoQueryRequest):
                     }
                 )
                 # Save bot message to Redis
-                chat_manager.add_message(chat_id, bot_message)
+                await run_in_threadpool(chat_manager.append_messages, chat, bot_message)
                 
-                yield f"data: {json.dumps({
-                    'type': 'final_answer',
-                    'message': answer,
-                    'response': answer,
-                    'answer': answer,
-                    'selected_document': '',
-                    'selection_score': 0.0,
-                    'documents_considered': 0,
-                    'chat_id': chat_id
-                })}\n\n"
+                yield sse({
+                    "type": "final_answer",
+                    "answer": answer,
+                    "selected_document": "",
+                    "selection_score": 0.0,
+                    "documents_considered": 0,
+                    "chat_id": chat_id
+                })
             else:
-                # Step 1: Get document selection (fast)
-                logger.info(f"🔍 Starting document selection for query: '{request.message[:50]}...'")
-                doc_selection = pipeline.get_most_relevant_documents(
-                    query=request.message,
-                    top_n=1,
-                    show_previews=False,
-                    normalization="sqrt"
-                )
-                
-                logger.info(f"📊 Document selection result: status={doc_selection.status}, total_found={doc_selection.total_documents_found}, documents={len(doc_selection.documents) if doc_selection.documents else 0}")
-                
-                if doc_selection.status != "success" or not doc_selection.documents:
-                    yield f"data: {json.dumps({
-                        'type': 'error',
-                        'error': 'No relevant documents found.',
-                        'documents_considered': doc_selection.total_documents_found,
-                        'chat_id': chat_id
-                    })}\n\n"
-                    return
-                
-                best_doc = doc_selection.documents[0]
-                selected_doc_id = best_doc.doc_id
-                selection_score = best_doc.relevance_score
+                # Step 1: Collect the document selection started above
+                if reused_doc:
+                    selected_doc_id = reused_doc["doc_id"]
+                    selection_score = reused_doc["selection_score"]
+                    documents_considered = reused_doc["documents_considered"]
+                    # The bare follow-up says little on its own, so retrieve with the
+                    # context-enhanced query instead
+                    retrieval_query = None
+                    query_embedding = None
+                    logger.info(f"♻️ Reusing last document for follow-up: {selected_doc_id}")
+                else:
+                    doc_selection = await asyncio.wait_for(doc_selection_task, STREAM_STAGE_TIMEOUT)
+                    
+                    logger.info(f"📊 Document selection result: status={doc_selection.status}, total_found={doc_selection.total_documents_found}, documents={len(doc_selection.documents) if doc_selection.documents else 0}")
+                    
+                    if doc_selection.status != "success" or not doc_selection.documents:
+                        yield sse({
+                            "type": "error",
+                            "error": "No relevant documents found.",
+                            "documents_considered": doc_selection.total_documents_found,
+                            "chat_id": chat_id
+                        })
+                        return
+                    
+                    best_doc = doc_selection.documents[0]
+                    selected_doc_id = best_doc.doc_id
+                    selection_score = best_doc.relevance_score
+                    documents_considered = doc_selection.total_documents_found
+                    # Search with the bare question, reusing its embedding from document selection
+                    retrieval_query = request.message
+                    query_embedding = doc_selection.query_embedding
                 
                 # Log document selection
                 if chat_id:
-                    chat_logger.log_document_selection(
+                    chat_logger.enqueue("log_document_selection", 
                         chat_id, 
                         request.message, 
                         selected_doc_id, 
                         selection_score, 
-                        doc_selection.total_documents_found
+                        documents_considered
                     )
                 
                 logger.info(f"📄 Sending document selection: {selected_doc_id} with score {selection_score}")
-                yield f"data: {json.dumps({
-                    'type': 'document_selected',
-                    'selected_document': selected_doc_id,
-                    'selection_score': selection_score,
-                    'documents_considered': doc_selection.total_documents_found,
-                    'chat_id': chat_id
-                })}\n\n"
+                yield sse({
+                    "type": "document_selected",
+                    "selected_document": selected_doc_id,
+                    "selection_score": selection_score,
+                    "documents_considered": documents_considered,
+                    "chat_id": chat_id
+                })
                 
-                conversation_context = chat.get_conversation_summary()
                 if conversation_context:
                     # Simple context injection - the model will determine relevance
                     enhanced_query = f"Previous conversation context:\n{conversation_context}\n\nCurrent question: {request.message}"
                 else:
                     enhanced_query = request.message
                 
-                rag_response = pipeline.run(
-                    question=enhanced_query,
-                    pdf_s3_key=selected_doc_id,
-                    top_k=5,
-                    use_summarization=False
-                )
+                answer_parts = []
+                async for token in iter_with_timeout(
+                    get_pipeline().run_stream(
+                        question=enhanced_query,
+                        pdf_s3_key=selected_doc_id,
+                        top_k=5,
+                        use_summarization=False,
+                        retrieval_query=retrieval_query,
+                        query_embedding=query_embedding
+                    ),
+                    STREAM_STAGE_TIMEOUT,
+                    http_request
+                ):
+                    answer_parts.append(token)
+                    yield token_frame_prefix + orjson.dumps(token) + TOKEN_FRAME_SUFFIX
+                answer = "".join(answer_parts).strip()
                 
-                logger.info(f"Generated answer for {selected_doc_id}, length: {len(rag_response.cleaned_response) if rag_response.cleaned_response else 0}")
+                logger.info(f"Generated answer for {selected_doc_id}, length: {len(answer)}")
                 
                 # Log RAG process
                 if chat_id:
-                    chat_logger.log_rag_process(
+                    chat_logger.enqueue("log_rag_process", 
                         chat_id,
                         enhanced_query,
                         selected_doc_id,
                         5,
-                        len(rag_response.cleaned_response) if rag_response.cleaned_response else 0
+                        len(answer)
                     )
                     
-                    chat_logger.log_bot_response(chat_id, rag_response.cleaned_response, {
+                    chat_logger.enqueue("log_bot_response", chat_id, answer, {
                         "type": "rag_answer",
                         "selected_document": selected_doc_id,
                         "selection_score": selection_score,
-                        "documents_considered": doc_selection.total_documents_found
+                        "documents_considered": documents_considered
                     })
                 
                 bot_message = ChatMessage(
-                    id=str(uuid.uuid4()),
-                    content=rag_response.cleaned_response,
+                    id=uuid.uuid4().hex,
+                    content=answer,
                     message_type=MessageType.BOT,
                     timestamp=datetime.now(),
                     metadata={
                         "selected_document": selected_doc_id,
                         "selection_score": selection_score,
-                        "documents_considered": doc_selection.total_documents_found
+                        "documents_considered": documents_considered
                     }
                 )
-                chat_manager.add_message(chat_id, bot_message)
+                await run_in_threadpool(chat_manager.append_messages, chat, bot_message)
+                await run_in_threadpool(redis_cache_set, last_doc_key(chat_id), {
+                    "doc_id": selected_doc_id,
+                    "selection_score": selection_score,
+                    "documents_considered": documents_considered
+                }, LAST_DOC_TTL)
                 
                 logger.info(f"Sending final answer for chat {chat_id} with document {selected_doc_id}")
-                yield f"data: {json.dumps({
-                    'type': 'final_answer',
-                    'message': rag_response.cleaned_response,
-                    'response': rag_response.cleaned_response,
-                    'answer': rag_response.cleaned_response,
-                    'selected_document': selected_doc_id,
-                    'selection_score': selection_score,
-                    'documents_considered': doc_selection.total_documents_found,
-                    'chat_id': chat_id
-                })}\n\n"
+                yield sse({
+                    "type": "final_answer",
+                    "answer": answer,
+                    "selected_document": selected_doc_id,
+                    "selection_score": selection_score,
+                    "documents_considered": documents_considered,
+                    "chat_id": chat_id
+                })
                 
+        except ClientDisconnected:
+            # The watcher already cancelled generation; nobody is left to answer
+            logger.info(f"Client disconnected mid-stream for chat {request.chat_id}")
+        except asyncio.CancelledError:
+            # Raised into the generator when the client goes away mid-stream
+            logger.info(f"Stream cancelled for chat {request.chat_id}")
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Stream stage timed out after {STREAM_STAGE_TIMEOUT}s for chat {request.chat_id}")
+            
+            if request.chat_id:
+                chat_logger.enqueue("log_error", request.chat_id, "stream_timeout", f"No progress within {STREAM_STAGE_TIMEOUT}s", {
+                    "message": request.message
+                })
+            
+            yield sse({"type": "error", "error": "Request timed out."})
         except Exception as e:
             logger.error(f"Error in auto_ask_question_stream: {str(e)}")
             
             if request.chat_id:
-                chat_logger.log_error(request.chat_id, "stream_error", str(e), {
+                chat_logger.enqueue("log_error", request.chat_id, "stream_error", str(e), {
                     "message": request.message,
                     "error_type": type(e).__name__
                 })
             
-            yield f"data: {json.dumps({'type': 'error', 'error': 'Internal server error occurred.'})}\n\n"
+            yield sse({"type": "error", "error": "Internal server error occurred."})
+        finally:
+            # Don't leave document selection running for a stream that ended early
+            if doc_selection_task and not doc_selection_task.done():
+                doc_selection_task.cancel()
     
     return StreamingResponse(
         generate_stream(),
-        media_type="text/plain",
+        media_type="text/event-stream",
         headers={
-            "Cache-Control": "no-cache",
+            "Cache-Control": "no-cache, no-transform",
             "Connection": "keep-alive",
-            "Content-Type": "text/event-stream"
+            "X-Accel-Buffering": "no"
         }
     )
 
+HEALTH_RESPONSE = {"status": "healthy", "service": "RAG Pipeline API"}
+
 @router.get("/health/")
-def health_check():
+async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "RAG Pipeline API"}
+    return HEALTH_RESPONSE
 
 @router.get("/list_pdfs/")
-def list_pdfs():
-    pdfs = uploader.list_pdfs()
-    filenames = [os.path.basename(pdf['key']) for pdf in pdfs]
-    documents = [{"id": filename, "name": filename, "type": "pdf", "status": "Ready"} 
-                for filename in filenames]
-    logger.info(f"Found {len(filenames)} PDFs: {filenames}")
-    return {"pdfs": filenames, "documents": documents}
+async def list_pdfs(request: Request):
+    await _ensure_list_pdfs_cache()
+    body, etag = _list_pdfs_cache["body"], _list_pdfs_cache["etag"]
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @router.get("/debug/available_docs/")
-def debug_available_docs():
+async def debug_available_docs():
     """Debug endpoint to check available documents"""
     try:
-        pdfs = uploader.list_pdfs()
-        doc_selection = pipeline.get_most_relevant_documents(
+        await _ensure_list_pdfs_cache()
+        pdf_names = _list_pdfs_cache["filenames"]
+        doc_selection = await run_in_threadpool(
+            get_pipeline().get_most_relevant_documents,
             query="test query",
             top_n=5,
             show_previews=False,
             normalization="sqrt"
         )
         return {
-            "uploaded_pdfs": len(pdfs),
-            "pdf_list": [os.path.basename(pdf['key']) for pdf in pdfs],
+            "uploaded_pdfs": len(pdf_names),
+            "pdf_list": pdf_names,
             "doc_selection_status": doc_selection.status,
             "total_documents_found": doc_selection.total_documents_found if hasattr(doc_selection, 'total_documents_found') else 0,
             "available_documents": len(doc_selection.documents) if hasattr(doc_selection, 'documents') and doc_selection.documents else 0
@@ -403,119 +609,125 @@ def debug_available_docs():
 
 # Chat Management Endpoints
 @router.post("/chats/")
-def create_chat(request: CreateChatRequest):
+async def create_chat(request: CreateChatRequest):
     """Create a new chat session"""
     title = request.title or "New Chat"
-    chat_id = chat_manager.create_chat(title)
-    chat = chat_manager.get_chat(chat_id)
+    chat_id = await run_in_threadpool(chat_manager.create_chat, title)
+    chat = await run_in_threadpool(chat_manager.get_chat, chat_id)
     if not chat:
-        return JSONResponse({"error": "Failed to create chat"}, status_code=500)
+        return ORJSONResponse({"error": "Failed to create chat"}, status_code=500)
     return {"chat_id": chat_id, "title": chat.title, "created_at": chat.created_at.isoformat()}
 
 @router.get("/chats/")
-def list_chats():
-    """List all chat sessions"""
-    return {"chats": chat_manager.list_chats()}
+async def list_chats(offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=200)):
+    """List chat sessions, most recent first, one page at a time"""
+    chats = await run_in_threadpool(chat_manager.list_chats, offset=offset, limit=limit)
+    total = await run_in_threadpool(chat_manager.count_chats)
+    return {
+        "chats": chats,
+        "total": total,
+        "offset": offset,
+        "limit": limit
+    }
 
 @router.get("/chats/{chat_id}")
-def get_chat(chat_id: str):
+async def get_chat(chat_id: str):
     """Get a specific chat with all messages"""
-    chat = chat_manager.get_chat(chat_id)
+    chat = await run_in_threadpool(chat_manager.get_chat, chat_id)
     if not chat:
-        return JSONResponse({"error": "Chat not found"}, status_code=404)
+        return ORJSONResponse({"error": "Chat not found"}, status_code=404)
     return chat.to_dict()
 
 @router.put("/chats/{chat_id}")
-def update_chat(chat_id: str, request: UpdateChatRequest):
+async def update_chat(chat_id: str, request: UpdateChatRequest):
     """Update chat title"""
-    success = chat_manager.update_chat_title(chat_id, request.title)
+    success = await run_in_threadpool(chat_manager.update_chat_title, chat_id, request.title)
     if not success:
-        return JSONResponse({"error": "Chat not found"}, status_code=404)
+        return ORJSONResponse({"error": "Chat not found"}, status_code=404)
     return {"message": "Chat updated successfully"}
 
 @router.delete("/chats/{chat_id}")
-def delete_chat(chat_id: str):
+async def delete_chat(chat_id: str):
     """Delete a chat session"""
-    success = chat_manager.delete_chat(chat_id)
+    success = await run_in_threadpool(chat_manager.delete_chat, chat_id)
     if not success:
-        return JSONResponse({"error": "Chat not found"}, status_code=404)
+        return ORJSONResponse({"error": "Chat not found"}, status_code=404)
     return {"message": "Chat deleted successfully"}
 
+def _parse_event_lines(lines: List[bytes]) -> list:
+    """Decode JSON lines, falling back to skipping bad lines only when one fails"""
+    try:
+        return [orjson.loads(line) for line in lines]
+    except orjson.JSONDecodeError:
+        events = []
+        for line in lines:
+            try:
+                events.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+        return events
+
+def _read_chat_logs(chat_dir: Path) -> Tuple[list, list]:
+    """Read a chat's structured events and raw log lines from disk"""
+    events = []
+    events_file = chat_dir / "events.jsonl"
+    if events_file.exists():
+        events = _parse_event_lines([line for line in events_file.read_bytes().splitlines() if line])
+    
+    log_file = chat_dir / "chat.log"
+    log_content = log_file.read_text(encoding='utf-8') if log_file.exists() else ""
+    
+    return events, log_content.split('\n') if log_content else []
+
 @router.get("/chats/{chat_id}/logs")
-def get_chat_logs(chat_id: str):
+async def get_chat_logs(chat_id: str):
     """Get logs for a specific chat"""
     try:
-        import os
-        from pathlib import Path
-        
         chat_dir = Path("chat_logs") / f"chat_{chat_id}"
         
         if not chat_dir.exists():
-            return JSONResponse({"error": "No logs found for this chat"}, status_code=404)
-        
-        events_file = chat_dir / "events.jsonl"
-        events = []
-        
-        if events_file.exists():
-            with open(events_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        events.append(json.loads(line.strip()))
-                    except json.JSONDecodeError:
-                        continue
-        
-        # Read log file
-        log_file = chat_dir / "chat.log"
-        log_content = ""
-        
-        if log_file.exists():
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_content = f.read()
+            return ORJSONResponse({"error": "No logs found for this chat"}, status_code=404)
         
-        # Get summary
-        summary = chat_logger.get_chat_summary(chat_id)
+        events, raw_logs = await run_in_threadpool(_read_chat_logs, chat_dir)
+        summary = await run_in_threadpool(chat_logger.get_chat_summary, chat_id)
         
         return {
             "chat_id": chat_id,
             "summary": summary,
             "events": events,
-            "raw_logs": log_content.split('\n') if log_content else []
+            "raw_logs": raw_logs
         }
         
     except Exception as e:
         logger.error(f"Error retrieving chat logs for {chat_id}: {e}")
-        return JSONResponse({"error": "Failed to retrieve chat logs"}, status_code=500)
+        return ORJSONResponse({"error": "Failed to retrieve chat logs"}, status_code=500)
 
 @router.get("/chats/logs/summary")
-def get_all_chat_logs_summary():
+async def get_all_chat_logs_summary():
     """Get summary of all chat logs"""
     try:
-        from pathlib import Path
-        
-        chat_logs_dir = Path("chat_logs")
-        
-        if not chat_logs_dir.exists():
-            return {"chats": []}
-        
-        summaries = []
-        for chat_dir in chat_logs_dir.iterdir():
-            if chat_dir.is_dir() and chat_dir.name.startswith('chat_'):
-                chat_id = chat_dir.name.replace('chat_', '')
-                summary = chat_logger.get_chat_summary(chat_id)
-                summaries.append(summary)
-        
-        return {"chats": summaries}
+        return {"chats": await run_in_threadpool(chat_logger.get_chat_summaries)}
         
     except Exception as e:
         logger.error(f"Error retrieving chat logs summary: {e}")
-        return JSONResponse({"error": "Failed to retrieve chat logs summary"}, status_code=500)
+        return ORJSONResponse({"error": "Failed to retrieve chat logs summary"}, status_code=500)
+
+@router.post("/admin/rebuild-log-index")
+async def rebuild_chat_log_index():
+    """Admin endpoint to rebuild the chat log summary index from disk"""
+    try:
+        summaries = await run_in_threadpool(chat_logger.rebuild_summary_index)
+        return {"message": f"Rebuilt chat log index for {len(summaries)} chats"}
+    except Exception as e:
+        logger.error(f"Error rebuilding chat log index: {e}")
+        return ORJSONResponse({"error": "Failed to rebuild chat log index"}, status_code=500)
 
 @router.post("/admin/cleanup-logs")
-def cleanup_old_chat_logs(days_to_keep: int = 30):
+async def cleanup_old_chat_logs(days_to_keep: int = 30):
     """Admin endpoint to cleanup old chat logs"""
     try:
-        chat_logger.cleanup_old_logs(days_to_keep)
+        await run_in_threadpool(chat_logger.cleanup_old_logs, days_to_keep)
         return {"message": f"Successfully cleaned up chat logs older than {days_to_keep} days"}
     except Exception as e:
         logger.error(f"Error cleaning up chat logs: {e}")
-        return JSONResponse({"error": "Failed to cleanup chat logs"}, status_code=500)
+        return ORJSONResponse({"error": "Failed to cleanup chat logs"}, status_code=500)
@@ -1,17 +1,65 @@
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from dotenv import load_dotenv
 from datetime import datetime
-from logger_config import get_logger
+from logger_config import get_logger, setup_logging, setup_transfer_logging
 
 load_dotenv()
 logger = get_logger(__name__)
 
 BUCKET = "pdf-storage-for-rag-1" 
 PDFS_FOLDER = "pdfs"
+PDF_SUFFIX = ".pdf"
+_PREFIX = PDFS_FOLDER + '/'
+
+# Files over 8MB go up as 16MB multipart chunks with parallel part uploads,
+# so large PDFs are never buffered whole in memory. Lower
+# S3_TRANSFER_CONCURRENCY when many files upload at once so the parts in
+# flight stay within the S3 client's connection pool.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=int(os.getenv('S3_TRANSFER_CONCURRENCY', '16')),
+    use_threads=True
+)
+
+# Number of files upload_pdf_directory sends to S3 at once
+UPLOAD_MAX_WORKERS = int(os.getenv('UPLOAD_MAX_WORKERS', '16'))
+# Attempts per file when S3 throttles or has a transient fault, backing off
+# 1s, 2s, ... (plus jitter) between them
+UPLOAD_ATTEMPTS = 3
+RETRYABLE_ERROR_CODES = ('SlowDown', '503', 'ServiceUnavailable', 'RequestTimeout', 'InternalError')
+
+# SQLite ledger recording the status of every file upload_pdf_directory sends,
+# so an interrupted run can be resumed without re-uploading finished files
+TRANSFER_LEDGER_PATH = os.getenv('UPLOAD_LEDGER_PATH', 'logs/transfer.db')
+
+# Maximum keys S3 accepts in one DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+# Keep the connection pool at least as large as the upload thread pool so
+# concurrent uploads reuse kept-alive connections instead of discarding them
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=max(32, UPLOAD_MAX_WORKERS),
+    tcp_keepalive=True,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=60
+)
 
 class PDFUploader:
     """
@@ -37,15 +85,17 @@ class PDFUploader:
                     's3',
                     aws_access_key_id=aws_access_key_id,
                     aws_secret_access_key=aws_secret_access_key,
-                    region_name=region_name
+                    region_name=region_name,
+                    config=S3_CLIENT_CONFIG
                 )
             else:
-                self.s3_client = boto3.client('s3', region_name=region_name)
+                self.s3_client = boto3.client('s3', region_name=region_name, config=S3_CLIENT_CONFIG)
                 
         except NoCredentialsError:
             raise ValueError("AWS credentials not found. Please provide credentials or set environment variables.")
     
-    def is_pdf_file(self, file_path: str) -> bool:
+    @staticmethod
+    def is_pdf_file(file_path: str) -> bool:
         """
         Check if the file is a PDF.
         
@@ -55,7 +105,8 @@ class PDFUploader:
         Returns:
             bool: True if file is a PDF, False otherwise
         """
-        return file_path.lower().endswith('.pdf')
+        # Lowercase only the suffix rather than copying the whole path
+        return file_path[-4:].lower() == PDF_SUFFIX
     
     def upload_pdf(self, local_pdf_path: str, s3_key: Optional[str] = None, 
                    metadata: Optional[Dict[str, str]] = None) -> bool:
@@ -70,122 +121,253 @@ class PDFUploader:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            if not os.path.exists(local_pdf_path):
-                print(f"❌ PDF file not found: {local_pdf_path}")
-                return False
-            
-            if not self.is_pdf_file(local_pdf_path):
-                print(f"❌ File is not a PDF: {local_pdf_path}")
-                return False
-            
-            if s3_key is None:
-                s3_key = os.path.join(PDFS_FOLDER, os.path.basename(local_pdf_path)).replace('\\', '/')
-            else:
-                s3_key = os.path.join(PDFS_FOLDER, s3_key).replace('\\', '/')
-            
-            extra_args: Dict[str, Any] = {
-                'ContentType': 'application/pdf',
-                'ContentDisposition': 'inline'
-            }
-            if metadata:
-                extra_args['Metadata'] = {str(k): str(v) for k, v in metadata.items()}
-            
-            logger.debug(f"Uploading PDF {local_pdf_path} to s3://{self.bucket_name}/{s3_key}")
-            self.s3_client.upload_file(local_pdf_path, self.bucket_name, s3_key, ExtraArgs=extra_args)
-            logger.info(f"Successfully uploaded PDF: {s3_key}")
-            return True
-            
-        except ClientError as e:
-            logger.error(f"AWS Error uploading PDF {local_pdf_path}: {e}")
+        if not os.path.exists(local_pdf_path):
+            logger.error(f"PDF file not found: {local_pdf_path}")
             return False
-        except Exception as e:
-            logger.error(f"Unexpected error uploading PDF {local_pdf_path}: {e}")
+        
+        if not self.is_pdf_file(local_pdf_path):
+            logger.error(f"File is not a PDF: {local_pdf_path}")
             return False
+        
+        if s3_key is None:
+            s3_key = os.path.basename(local_pdf_path)
+        
+        return self._upload_file(local_pdf_path, s3_key, metadata)
+    
+    def _upload_file(self, local_pdf_path: str, s3_key: str, 
+                     metadata: Optional[Dict[str, str]] = None, size: Optional[int] = None) -> bool:
+        """
+        Upload a file already known to exist and be a PDF to pdfs/<s3_key>,
+        retrying with exponential backoff when S3 throttles or has a transient fault
+        """
+        s3_key = f"{_PREFIX}{s3_key}"
+        extra_args: Dict[str, Any] = {
+            'ContentType': 'application/pdf',
+            'ContentDisposition': 'inline'
+        }
+        if metadata:
+            extra_args['Metadata'] = {str(k): str(v) for k, v in metadata.items()}
+        
+        for attempt in range(UPLOAD_ATTEMPTS):
+            try:
+                if size is None:
+                    size = os.path.getsize(local_pdf_path)
+                
+                logger.debug(f"Uploading PDF {local_pdf_path} to s3://{self.bucket_name}/{s3_key}")
+                self.s3_client.upload_file(
+                    local_pdf_path, self.bucket_name, s3_key,
+                    ExtraArgs=extra_args, Config=TRANSFER_CONFIG
+                )
+                logger.info(f"upload status=success key={s3_key} bytes={size} path={local_pdf_path}")
+                return True
+            
+            except (ClientError, S3UploadFailedError) as e:
+                if attempt < UPLOAD_ATTEMPTS - 1 and self._is_retryable(e):
+                    logger.warning(f"upload status=retry key={s3_key} attempt={attempt + 1} error={e}")
+                    time.sleep(2 ** attempt + random.random() * 0.2)
+                    continue
+                logger.error(f"upload status=failure key={s3_key} bytes={size} path={local_pdf_path} error={e}")
+                return False
+            except Exception as e:
+                logger.error(f"upload status=failure key={s3_key} bytes={size} path={local_pdf_path} error={e}")
+                return False
+        return False
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Whether an upload error is S3 throttling or a transient server fault"""
+        if isinstance(error, ClientError):
+            return error.response.get('Error', {}).get('Code') in RETRYABLE_ERROR_CODES
+        # upload_file wraps the ClientError message as "... An error occurred (Code) ..."
+        message = str(error)
+        return any(f"({code})" in message for code in RETRYABLE_ERROR_CODES)
     
-    def upload_pdf_directory(self, local_directory: str) -> Dict[str, Any]:
+    def upload_pdf_directory(self, local_directory: str, resume: bool = False,
+                             ledger_path: Optional[str] = TRANSFER_LEDGER_PATH) -> Dict[str, Any]:
         """
         Upload all PDF files from a directory to S3.
         
         Args:
             local_directory: Path to the local directory containing PDFs
+            resume: Skip files the ledger already records as uploaded
+            ledger_path: SQLite ledger of per-file transfer status (None disables it)
             
         Returns:
             Dict with upload results
         """
         if not os.path.exists(local_directory):
-            print(f"❌ Directory not found: {local_directory}")
-            return {"success": False, "uploaded": 0, "failed": 0, "skipped": 0}
+            logger.error(f"Directory not found: {local_directory}")
+            return {"success": False, "uploaded": 0, "failed": 0, "skipped": 0, "resumed": 0}
         
-        uploaded_count = 0
-        failed_count = 0
         skipped_count = 0
+        resumed_count = 0
         upload_results = []
+        results_lock = threading.Lock()
         
-        for root, dirs, files in os.walk(local_directory):
-            for file in files:
-                local_file_path = os.path.join(root, file)
-                
-                if not self.is_pdf_file(local_file_path):
+        ledger = self._open_ledger(ledger_path) if ledger_path else None
+        done = set()
+        if ledger is not None and resume:
+            done = {row[0] for row in ledger.execute("SELECT local FROM transfers WHERE status = 'done'")}
+        
+        # The walk feeds a bounded queue so uploads start while the tree is
+        # still being enumerated; the S3 client is shared by every worker
+        work: queue.Queue = queue.Queue(maxsize=2 * UPLOAD_MAX_WORKERS)
+        
+        def worker():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                local_file_path, relative_path, size = item
+                # A dead worker would leave the bounded queue full and block the
+                # producer forever, so no error may escape this loop
+                try:
+                    # The walk already established the file exists and is a PDF
+                    success = self._upload_file(local_file_path, relative_path, size=size)
+                except Exception as e:
+                    logger.error(f"upload status=failure key={_PREFIX}{relative_path} path={local_file_path} error={e}")
+                    success = False
+                with results_lock:
+                    if ledger is not None:
+                        try:
+                            self._record_transfer(ledger, local_file_path, 'done' if success else 'failed')
+                        except Exception as e:
+                            logger.error(f"Failed to record transfer of {local_file_path} in ledger: {e}")
+                    upload_results.append({
+                        "local_path": local_file_path,
+                        "s3_key": f"{_PREFIX}{relative_path}",
+                        "success": success
+                    })
+        
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(UPLOAD_MAX_WORKERS)]
+        for thread in workers:
+            thread.start()
+        
+        try:
+            for entry in self._walk_files(local_directory):
+                if not self.is_pdf_file(entry.name):
                     skipped_count += 1
                     continue
                 
-                relative_path = os.path.relpath(local_file_path, local_directory)
-                s3_key = os.path.join(PDFS_FOLDER, relative_path).replace('\\', '/')
-                
-                success = self.upload_pdf(local_file_path, s3_key)
-                if success:
-                    uploaded_count += 1
-                else:
-                    failed_count += 1
+                local_file_path = os.path.abspath(entry.path)
+                if local_file_path in done:
+                    resumed_count += 1
+                    continue
                 
-                upload_results.append({
-                    "local_path": local_file_path,
-                    "s3_key": s3_key,
-                    "success": success
-                })
+                relative_path = os.path.relpath(entry.path, local_directory)
+                if os.sep != '/':
+                    relative_path = relative_path.replace(os.sep, '/')
+                if ledger is not None:
+                    with results_lock:
+                        ledger.execute(
+                            "INSERT OR IGNORE INTO transfers (local, key, status, attempts, ts) "
+                            "VALUES (?, ?, 'pending', 0, ?)",
+                            (local_file_path, f"{_PREFIX}{relative_path}", datetime.now().isoformat())
+                        )
+                        ledger.commit()
+                work.put((local_file_path, relative_path, entry.stat().st_size))
+        finally:
+            for _ in workers:
+                work.put(None)
+            for thread in workers:
+                thread.join()
+            if ledger is not None:
+                ledger.close()
+        
+        uploaded_count = sum(1 for result in upload_results if result["success"])
+        failed_count = len(upload_results) - uploaded_count
         
         return {
             "success": failed_count == 0,
             "uploaded": uploaded_count,
             "failed": failed_count,
             "skipped": skipped_count,
+            "resumed": resumed_count,
             "results": upload_results
         }
     
-    def list_pdfs(self, max_keys: int = 1000) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _open_ledger(ledger_path: str) -> sqlite3.Connection:
+        """Open the transfer ledger, creating its table on first use"""
+        directory = os.path.dirname(ledger_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Workers share the connection under the results lock
+        ledger = sqlite3.connect(ledger_path, check_same_thread=False)
+        ledger.execute("PRAGMA journal_mode=WAL")
+        ledger.execute("PRAGMA synchronous=NORMAL")
+        ledger.execute(
+            "CREATE TABLE IF NOT EXISTS transfers "
+            "(local TEXT PRIMARY KEY, key TEXT, status TEXT, attempts INT, ts TEXT)"
+        )
+        ledger.commit()
+        return ledger
+    
+    @staticmethod
+    def _record_transfer(ledger: sqlite3.Connection, local_path: str, status: str) -> None:
+        """Record the outcome of one upload attempt in the ledger"""
+        ledger.execute(
+            "UPDATE transfers SET status = ?, attempts = attempts + 1, ts = ? WHERE local = ?",
+            (status, datetime.now().isoformat(), local_path)
+        )
+        ledger.commit()
+    
+    @staticmethod
+    def _walk_files(root: str) -> Iterator[os.DirEntry]:
+        """Yield every file under root using scandir, without following directory symlinks"""
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+    
+    def iter_pdfs(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield PDF files in the S3 bucket page by page, following pagination.
+        
+        last_modified is left as the datetime boto3 returns; list_pdfs turns
+        it into an ISO string. Raises ClientError if a page cannot be listed.
         """
-        List PDF files in the S3 bucket.
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=_PREFIX,
+            PaginationConfig={'PageSize': 1000}
+        )
+        
+        for page in pages:
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                # Filter only PDF files
+                if self.is_pdf_file(key):
+                    yield {
+                        'key': key,
+                        'size': obj['Size'],
+                        'last_modified': obj['LastModified'],
+                        'etag': obj['ETag']
+                    }
+    
+    def list_pdfs(self, max_keys: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List PDF files in the S3 bucket, following pagination across all pages.
         
         Args:
-            max_keys: Maximum number of keys to return
+            max_keys: Optional cap on the number of PDFs returned (default: all)
             
         Returns:
-            List of PDF objects with metadata
+            List of PDF objects with metadata (last_modified as an ISO string)
         """
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=PDFS_FOLDER + '/',
-                MaxKeys=max_keys
-            )
-            
-            pdf_objects = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Filter only PDF files
-                    if obj['Key'].lower().endswith('.pdf'):
-                        pdf_objects.append({
-                            'key': obj['Key'],
-                            'size': obj['Size'],
-                            'last_modified': obj['LastModified'].isoformat(),
-                            'etag': obj['ETag']
-                        })
-            
-            return pdf_objects
-            
+            return [
+                {**obj, 'last_modified': obj['last_modified'].isoformat()}
+                for obj in islice(self.iter_pdfs(), max_keys)
+            ]
         except ClientError as e:
-            print(f"❌ Error listing PDF files: {e}")
+            logger.error(f"Error listing PDF files: {e}")
             return []
     
     def delete_pdf(self, s3_key: str) -> bool:
@@ -198,21 +380,160 @@ class PDFUploader:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            # Always delete from /pdfs folder
-            if not s3_key.lower().endswith('.pdf'):
-                print(f"❌ File is not a PDF: {s3_key}")
-                return False
-            s3_key = os.path.join(PDFS_FOLDER, os.path.basename(s3_key)).replace('\\', '/')
+        if not self.is_pdf_file(s3_key):
+            logger.error(f"File is not a PDF: {s3_key}")
+            return False
+        result = self.delete_pdfs([s3_key])
+        return result["deleted"] == 1
+    
+    def delete_pdfs(self, s3_keys: List[str]) -> Dict[str, Any]:
+        """
+        Delete many PDF files from S3 using batched DeleteObjects requests.
+        
+        Args:
+            s3_keys: S3 object keys or filenames of the PDFs to delete
             
-            print(f"Deleting PDF s3://{self.bucket_name}/{s3_key}")
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
-            print(f" Successfully deleted PDF: {s3_key}")
-            return True
+        Returns:
+            Dict with the number deleted and the keys that failed or were skipped
+        """
+        # Always delete from /pdfs folder
+        keys = []
+        skipped = []
+        for s3_key in s3_keys:
+            if self.is_pdf_file(s3_key):
+                keys.append(f"{_PREFIX}{os.path.basename(s3_key)}")
+            else:
+                skipped.append(s3_key)
+        
+        # DeleteObjects accepts at most 1000 keys per request
+        batches = [keys[i:i + DELETE_BATCH_SIZE] for i in range(0, len(keys), DELETE_BATCH_SIZE)]
+        
+        deleted_count = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, min(UPLOAD_MAX_WORKERS, len(batches)))) as executor:
+            futures = {executor.submit(self._delete_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    errors = future.result()
+                except ClientError as e:
+                    logger.error(f"Error deleting {len(batch)} PDFs: {e}")
+                    failed.extend(batch)
+                    continue
+                failed.extend(errors)
+                deleted_count += len(batch) - len(errors)
+        
+        logger.info(f"Deleted {deleted_count} PDFs from s3://{self.bucket_name}/{_PREFIX} ({len(failed)} failed)")
+        return {"deleted": deleted_count, "failed": failed, "skipped": skipped}
+    
+    def _delete_batch(self, keys: List[str]) -> List[str]:
+        """Delete one batch of keys and return the keys S3 reported as failed"""
+        response = self.s3_client.delete_objects(
+            Bucket=self.bucket_name,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        )
+        errors = response.get('Errors', [])
+        for error in errors:
+            logger.error(f"Error deleting PDF {error.get('Key')}: {error.get('Message')}")
+        return [error.get('Key') for error in errors]
+    
+    def copy_pdf(self, src_bucket: str, src_key: str, dst_key: Optional[str] = None) -> bool:
+        """
+        Copy a PDF from another bucket into /pdfs without routing bytes through this host.
+        
+        Large objects are copied server-side part by part (UploadPartCopy).
+        
+        Args:
+            src_bucket: Bucket holding the source PDF
+            src_key: Key of the source PDF
+            dst_key: Destination key (default: pdfs/<basename of src_key>)
             
-        except ClientError as e:
-            print(f" Error deleting PDF {s3_key}: {e}")
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_pdf_file(src_key):
+            logger.error(f"File is not a PDF: {src_key}")
             return False
+        dst_key = dst_key or f"{_PREFIX}{os.path.basename(src_key)}"
+        
+        for attempt in range(UPLOAD_ATTEMPTS):
+            try:
+                self.s3_client.copy(
+                    CopySource={'Bucket': src_bucket, 'Key': src_key},
+                    Bucket=self.bucket_name, Key=dst_key,
+                    Config=TRANSFER_CONFIG
+                )
+                logger.info(f"copy status=success src=s3://{src_bucket}/{src_key} key={dst_key}")
+                return True
+            except ClientError as e:
+                if attempt < UPLOAD_ATTEMPTS - 1 and self._is_retryable(e):
+                    logger.warning(f"copy status=retry key={dst_key} attempt={attempt + 1} error={e}")
+                    time.sleep(2 ** attempt + random.random() * 0.2)
+                    continue
+                logger.error(f"copy status=failure src=s3://{src_bucket}/{src_key} key={dst_key} error={e}")
+                return False
+            except Exception as e:
+                logger.error(f"copy status=failure src=s3://{src_bucket}/{src_key} key={dst_key} error={e}")
+                return False
+        return False
+    
+    def copy_pdfs(self, src_bucket: str, src_keys: List[str]) -> Dict[str, Any]:
+        """
+        Copy many PDFs from another bucket into /pdfs concurrently.
+        
+        Args:
+            src_bucket: Bucket holding the source PDFs
+            src_keys: Keys of the source PDFs
+            
+        Returns:
+            Dict with copy results
+        """
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, min(UPLOAD_MAX_WORKERS, len(src_keys)))) as executor:
+            futures = {executor.submit(self.copy_pdf, src_bucket, src_key): src_key for src_key in src_keys}
+            for future in as_completed(futures):
+                results.append({"src_key": futures[future], "success": future.result()})
+        
+        copied_count = sum(1 for result in results if result["success"])
+        failed_count = len(results) - copied_count
+        
+        return {
+            "success": failed_count == 0,
+            "copied": copied_count,
+            "failed": failed_count,
+            "results": results
+        }
+    
+    def presign_upload(self, filename: str, expires: int = 3600, max_mb: int = 100) -> Optional[Dict[str, Any]]:
+        """
+        Create a pre-signed POST so a client can upload a PDF straight to S3.
+        
+        Args:
+            filename: Name for the file in S3 (should end with .pdf)
+            expires: Seconds the signed form stays valid
+            max_mb: Largest upload the signed form accepts, in megabytes
+            
+        Returns:
+            Dict with 'url' and 'fields' to post, or None on failure
+        """
+        if not self.is_pdf_file(filename):
+            logger.error(f"File is not a PDF: {filename}")
+            return None
+        s3_key = f"{_PREFIX}{os.path.basename(filename)}"
+        try:
+            return self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Fields={'Content-Type': 'application/pdf'},
+                Conditions=[
+                    ['content-length-range', 0, max_mb * 1024 * 1024],
+                    {'Content-Type': 'application/pdf'}
+                ],
+                ExpiresIn=expires
+            )
+        except Exception as e:
+            logger.error(f"Error presigning upload for {s3_key}: {e}")
+            return None
     
     def upload_pdf_fileobj(self, fileobj, filename: str, metadata: Optional[Dict[str, str]] = None) -> bool:
         """
@@ -227,28 +548,39 @@ class PDFUploader:
             bool: True if successful, False otherwise
         """
         try:
-            if not filename.lower().endswith('.pdf'):
-                print(f"❌ File is not a PDF: {filename}")
+            if not self.is_pdf_file(filename):
+                logger.error(f"File is not a PDF: {filename}")
                 return False
-            s3_key = os.path.join(PDFS_FOLDER, filename).replace('\\', '/')
+            s3_key = f"{_PREFIX}{filename}"
             extra_args: Dict[str, Any] = {
                 'ContentType': 'application/pdf',
                 'ContentDisposition': 'inline'
             }
             if metadata:
                 extra_args['Metadata'] = metadata
-            print(f"📤 Uploading PDF fileobj to s3://{self.bucket_name}/{s3_key}")
-            self.s3_client.upload_fileobj(fileobj, self.bucket_name, s3_key, ExtraArgs=extra_args)
-            print(f"✅ Successfully uploaded PDF: {s3_key}")
+            logger.debug(f"Uploading PDF fileobj to s3://{self.bucket_name}/{s3_key}")
+            self.s3_client.upload_fileobj(
+                fileobj, self.bucket_name, s3_key,
+                ExtraArgs=extra_args, Config=TRANSFER_CONFIG
+            )
+            logger.info(f"upload status=success key={s3_key}")
             return True
-        except ClientError as e:
-            print(f"❌ AWS Error uploading PDF fileobj: {e}")
-            return False
         except Exception as e:
-            print(f"❌ Unexpected error uploading PDF fileobj: {e}")
+            logger.error(f"upload status=failure key={s3_key} error={e}")
             return False
 
 
+@lru_cache(maxsize=1)
+def get_uploader() -> PDFUploader:
+    """
+    Return the shared PDFUploader, creating it on first use.
+    
+    Creation is deferred until the first call so each worker process builds
+    its own S3 client after forking rather than inheriting one.
+    """
+    return PDFUploader()
+
+
 def main():
     """
     Main function for command-line usage.
@@ -261,10 +593,14 @@ def main():
     parser.add_argument('--s3-key', help='S3 key for single PDF upload (filename only, will be placed in /pdfs)')
     parser.add_argument('--list', action='store_true', help='List PDF files in bucket')
     parser.add_argument('--delete', help='Delete a PDF by filename (will be deleted from /pdfs)')
+    parser.add_argument('--resume', action='store_true', help='With --directory, skip files already uploaded by a previous run')
     
     args = parser.parse_args()
     
-    uploader = PDFUploader()
+    # Errors go to the console, per-file results also to the transfer log
+    setup_logging()
+    setup_transfer_logging(logger_name=logger.name)
+    uploader = get_uploader()
 
     if args.list:
         print(f"📋 Listing PDF files in bucket: {BUCKET}")
@@ -276,12 +612,18 @@ def main():
         else:
             print("  No PDF files found.")
     elif args.delete:
-        uploader.delete_pdf(args.delete)
+        if uploader.delete_pdf(args.delete):
+            print(f"🗑️ Deleted PDF: {args.delete}")
+        else:
+            print(f"❌ Failed to delete PDF: {args.delete}")
     elif args.pdf:
-        uploader.upload_pdf(args.pdf, args.s3_key)
+        if uploader.upload_pdf(args.pdf, args.s3_key):
+            print(f"✅ Uploaded PDF: {args.pdf}")
+        else:
+            print(f"❌ Failed to upload PDF: {args.pdf}")
     elif args.directory:
-        result = uploader.upload_pdf_directory(args.directory)
-        print(f"📊 Upload complete: {result['uploaded']} PDFs uploaded, {result['failed']} failed, {result['skipped']} non-PDF files skipped")
+        result = uploader.upload_pdf_directory(args.directory, resume=args.resume)
+        print(f"📊 Upload complete: {result['uploaded']} PDFs uploaded, {result['failed']} failed, {result['skipped']} non-PDF files skipped, {result['resumed']} already uploaded")
     else:
         print("❌ Please specify --pdf, --directory, --list, or --delete")
 
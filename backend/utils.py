@@ -2,7 +2,7 @@
 Utility functions for RAG pipeline
 """
 import os
-import json
+import orjson
 import datetime
 import re
 import csv
@@ -11,17 +11,24 @@ from typing import List, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
+error_logger = logging.getLogger('errors')
+
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+PDFS_PREFIX = "pdfs/"
 
 def save_log_to_file(log_dir: str, file_prefix: str, content) -> None:
     """Save content to log file"""
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
     
     file_path = os.path.join(log_dir, f"{file_prefix}.json")
     
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(content, f, indent=4, ensure_ascii=False)
+        data = orjson.dumps(
+            content,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+        with open(file_path, 'wb') as f:
+            f.write(data)
         logger.info(f"Successfully saved log to {file_path}")
     except Exception as e:
         txt_path = os.path.join(log_dir, f"{file_prefix}.txt")
@@ -30,22 +37,73 @@ def save_log_to_file(log_dir: str, file_prefix: str, content) -> None:
         logger.warning(f"Could not save as JSON, saved as plain text to {txt_path}. Error: {e}")
 
 def log_error_to_file(error_message: str, error_type: str = "general") -> None:
-    """Log error message to file"""
-    error_dir = os.path.join(os.path.dirname(__file__), "error_logs")
-    if not os.path.exists(error_dir):
-        os.makedirs(error_dir)
-    
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    file_path = os.path.join(error_dir, f"{timestamp}_{error_type}_error.log")
-    
-    with open(file_path, 'a', encoding='utf-8') as f:
-        f.write(f"[{datetime.datetime.now().isoformat()}] {error_message}\n")
+    """Log error message to the rotating error log (see logger_config.setup_error_logging)"""
+    error_logger.error(f"[{error_type}] {error_message}")
 
 def clean_llm_response(raw_response: str) -> str:
     """Remove thinking tags from LLM response"""
-    pattern = re.compile(r"<think>.*?</think>", re.DOTALL)
-    cleaned_response = re.sub(pattern, "", raw_response)
-    return cleaned_response.strip()
+    return _THINK_RE.sub("", raw_response).strip()
+
+class ThinkTagFilter:
+    """Incrementally remove <think>...</think> sections from streamed LLM output.
+
+    Produces the same text as clean_llm_response would for the full response,
+    holding back only what might still be part of a tag or a thinking block.
+    """
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+    
+    def __init__(self):
+        self._buffer = ""
+        self._in_think = False
+        self._started = False
+    
+    @staticmethod
+    def _partial_tag_length(text: str, tag: str) -> int:
+        """Length of the longest suffix of text that is a proper prefix of tag"""
+        for length in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:length]):
+                return length
+        return 0
+    
+    def _emit(self, text: str) -> str:
+        # Mirror the leading strip() of clean_llm_response
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+    
+    def feed(self, chunk: str) -> str:
+        """Add a streamed chunk and return the text that is now safe to show"""
+        self._buffer += chunk
+        visible = []
+        while True:
+            if self._in_think:
+                end = self._buffer.find(self.CLOSE_TAG)
+                if end == -1:
+                    break
+                self._buffer = self._buffer[end + len(self.CLOSE_TAG):]
+                self._in_think = False
+            else:
+                start = self._buffer.find(self.OPEN_TAG)
+                if start == -1:
+                    keep = self._partial_tag_length(self._buffer, self.OPEN_TAG)
+                    visible.append(self._buffer[:len(self._buffer) - keep])
+                    self._buffer = self._buffer[len(self._buffer) - keep:]
+                    break
+                visible.append(self._buffer[:start])
+                # Keep the open tag buffered so an unclosed block is not lost
+                self._buffer = self._buffer[start:]
+                self._in_think = True
+        return self._emit("".join(visible))
+    
+    def flush(self) -> str:
+        """Return whatever is still buffered once the stream has ended"""
+        # An unclosed <think> block is left untouched, as clean_llm_response does
+        rest = self._buffer
+        self._buffer = ""
+        self._in_think = False
+        return self._emit(rest)
 
 def format_tables_for_llm(tables_data: List[Dict]) -> str:
     """Format table data as markdown for LLM consumption"""
@@ -60,8 +118,22 @@ def format_tables_for_llm(tables_data: List[Dict]) -> str:
             continue
         
         try:
-            reader = csv.reader(StringIO(csv_string))
-            rows = list(reader)
+            # Only quoted fields can hide commas or newlines; plain CSV splits directly.
+            # A '\r' that does not end a line is left to csv.reader, which rejects it.
+            if '"' in csv_string or csv_string.count('\r') != csv_string.count('\r\n'):
+                rows = list(csv.reader(StringIO(csv_string)))
+            else:
+                # Split on '\n' only: splitlines() also breaks on form feeds and
+                # other separators that csv.reader keeps inside a field
+                lines = csv_string.split('\n')
+                if lines[-1] == '':
+                    lines.pop()
+                rows = []
+                for line in lines:
+                    if line.endswith('\r'):
+                        line = line[:-1]
+                    # csv.reader yields an empty row for a blank line
+                    rows.append(line.split(',') if line else [])
             
             if not rows:
                 continue
@@ -84,10 +156,10 @@ def generate_timestamp() -> str:
 
 def extract_pdf_id_from_s3_key(s3_key: str) -> str:
     """Extract PDF ID from S3 key"""
-    return os.path.splitext(os.path.basename(s3_key))[0]
+    return s3_key.rsplit('/', 1)[-1].rsplit('.', 1)[0]
 
 def normalize_s3_key(pdf_filename_or_s3_key: str) -> str:
     """Normalize filename to full S3 key"""
-    if not ("/" in pdf_filename_or_s3_key or "\\" in pdf_filename_or_s3_key):
-        return f"pdfs/{pdf_filename_or_s3_key}"
-    return pdf_filename_or_s3_key
+    if "/" in pdf_filename_or_s3_key or "\\" in pdf_filename_or_s3_key:
+        return pdf_filename_or_s3_key
+    return PDFS_PREFIX + pdf_filename_or_s3_key
@@ -2,9 +2,13 @@ import React, { useState, useEffect } from 'react'
 import { chatAPI } from '../services/api'
 import './ChatSidebar.css'
 
+const CHAT_PAGE_SIZE = 50
+
 const ChatSidebar = ({ currentChatId, onChatSelect, isOpen, onToggle }) => {
   const [chats, setChats] = useState([])
+  const [totalChats, setTotalChats] = useState(0)
   const [loading, setLoading] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState(null)
   const [editingChatId, setEditingChatId] = useState(null)
   const [editTitle, setEditTitle] = useState('')
@@ -16,18 +20,38 @@ const ChatSidebar = ({ currentChatId, onChatSelect, isOpen, onToggle }) => {
   const loadChats = async () => {
     try {
       setLoading(true)
-      const chatList = await chatAPI.listChats()
+      const { chats: chatList, total } = await chatAPI.listChats(0, CHAT_PAGE_SIZE)
       // Ensure chatList is an array
       setChats(Array.isArray(chatList) ? chatList : [])
+      setTotalChats(total)
     } catch (err) {
       setError('Failed to load chats')
       console.error('Error loading chats:', err)
       setChats([]) // Set empty array on error
+      setTotalChats(0)
     } finally {
       setLoading(false)
     }
   }
 
+  const loadMoreChats = async () => {
+    try {
+      setLoadingMore(true)
+      const { chats: page, total } = await chatAPI.listChats(chats.length, CHAT_PAGE_SIZE)
+      // Chats created or moved since the last page can shift offsets, so skip ones already shown
+      setChats(prevChats => {
+        const shown = new Set(prevChats.map(chat => chat.id))
+        return [...prevChats, ...page.filter(chat => !shown.has(chat.id))]
+      })
+      setTotalChats(total)
+    } catch (err) {
+      setError('Failed to load more chats')
+      console.error('Error loading more chats:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleCreateChat = async () => {
     try {
       const newChat = await chatAPI.createChat()
@@ -43,6 +67,7 @@ const ChatSidebar = ({ currentChatId, onChatSelect, isOpen, onToggle }) => {
           last_message: ''
         }
         setChats(prevChats => [formattedChat, ...prevChats])
+        setTotalChats(prevTotal => prevTotal + 1)
         onChatSelect(newChat.id)
       }
     } catch (err) {
@@ -56,6 +81,7 @@ const ChatSidebar = ({ currentChatId, onChatSelect, isOpen, onToggle }) => {
     try {
       await chatAPI.deleteChat(chatId)
       setChats(prevChats => prevChats.filter(chat => chat.id !== chatId))
+      setTotalChats(prevTotal => Math.max(prevTotal - 1, 0))
       
       // If deleting current chat, select the first available chat or create new one
       if (chatId === currentChatId) {
@@ -247,6 +273,16 @@ const ChatSidebar = ({ currentChatId, onChatSelect, isOpen, onToggle }) => {
                   No chats yet. Create your first chat!
                 </div>
               )}
+
+              {chats.length < totalChats && (
+                <button
+                  className="load-more-btn"
+                  onClick={loadMoreChats}
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              )}
             </div>
           )}
         </div>
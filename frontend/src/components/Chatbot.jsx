@@ -185,7 +185,7 @@ const Chatbot = () => {
 
       // Initialize chat
       try {
-        const chats = await chatAPI.listChats()
+        const { chats } = await chatAPI.listChats(0, 1)
         if (chats.length > 0) {
           handleChatSelect(chats[0].id)
         } else {
@@ -304,6 +304,10 @@ const Chatbot = () => {
     setError(null)
     setDebugInfo(null) // Reset debug info
 
+    // The answer is shown as it streams in and replaced by the final message
+    const streamingMessageId = Date.now() + 1
+    let streamedText = ''
+
     try {
       console.log('📤 Sending message:', inputMessage)
       console.log('💬 Using chat ID:', currentChatId)
@@ -316,7 +320,7 @@ const Chatbot = () => {
           console.log('✅ Final answer received:', data)
           console.log('✅ Answer length:', data.answer?.length || 0)
           const botMessage = {
-            id: Date.now() + 1,
+            id: streamingMessageId,
             type: 'bot',
             content: preprocessAIResponse(data.answer),
             timestamp: new Date(),
@@ -326,7 +330,7 @@ const Chatbot = () => {
               documentsConsidered: data.documents_considered
             }
           }
-          setMessages(prev => [...prev, botMessage])
+          setMessages(prev => [...prev.filter(msg => msg.id !== streamingMessageId), botMessage])
         },
         // On error
         (error) => {
@@ -345,6 +349,14 @@ const Chatbot = () => {
         (data) => {
           console.log('🔍 Debug callback received:', data)
           setDebugInfo(data)
+        },
+        // On token
+        (data) => {
+          streamedText += data.delta
+          const content = preprocessAIResponse(streamedText)
+          setMessages(prev => prev.some(msg => msg.id === streamingMessageId)
+            ? prev.map(msg => msg.id === streamingMessageId ? { ...msg, content } : msg)
+            : [...prev, { id: streamingMessageId, type: 'bot', content, timestamp: new Date() }])
         }
       )
     } catch (error) {
@@ -49,7 +49,7 @@ export const chatAPI = {
   },
 
   // Send a message with streaming
-  sendMessageStream: async (message, chatId, onFinalAnswer, onError, onDebug = null) => {
+  sendMessageStream: async (message, chatId, onFinalAnswer, onError, onDebug = null, onToken = null) => {
     try {
       const response = await fetch(`${API_BASE_URL}/auto_ask_stream/`, {
         method: 'POST',
@@ -65,20 +65,25 @@ export const chatAPI = {
 
       const reader = response.body.getReader()
       const decoder = new TextDecoder()
+      // Frames can be split across reads, so keep any incomplete line for the next chunk
+      let buffered = ''
 
       while (true) {
         const { value, done } = await reader.read()
         if (done) break
 
-        const chunk = decoder.decode(value)
-        const lines = chunk.split('\n')
+        buffered += decoder.decode(value, { stream: true })
+        const lines = buffered.split('\n')
+        buffered = lines.pop()
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
             try {
               const data = JSON.parse(line.slice(6))
               
-              if (data.type === 'final_answer') {
+              if (data.type === 'token') {
+                if (onToken) onToken(data)
+              } else if (data.type === 'final_answer') {
                 console.log('🔄 API: Final answer event:', data)
                 onFinalAnswer(data)
               } else if (data.type === 'error') {
@@ -109,14 +114,18 @@ export const chatAPI = {
     return { id: response.data.chat_id, ...response.data } // Normalize id field
   },
 
-  listChats: async () => {
-    const response = await api.get('/chats/')
+  // List one page of chats (most recent first) along with the total count
+  listChats: async (offset = 0, limit = 50) => {
+    const response = await api.get('/chats/', { params: { offset, limit } })
     const chats = response.data.chats || []
     // Normalize id field for consistency
-    return chats.map(chat => ({ 
-      id: chat.chat_id || chat.id, 
-      ...chat 
-    }))
+    return {
+      chats: chats.map(chat => ({ 
+        id: chat.chat_id || chat.id, 
+        ...chat 
+      })),
+      total: response.data.total ?? chats.length
+    }
   },
 
   getChat: async (chatId) => {